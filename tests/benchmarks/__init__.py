@@ -0,0 +1,6 @@
+"""Benchmark the rendering steps with representative documents.
+
+Run ``python -m tests.benchmarks --help`` from the root of the repository to
+get the available options.
+
+"""
@@ -0,0 +1,199 @@
+"""Command-line interface running benchmarks."""
+
+import argparse
+import io
+import json
+import platform
+import subprocess
+import sys
+import tracemalloc
+from time import perf_counter
+
+from weasyprint import DEFAULT_OPTIONS, HTML, VERSION
+from weasyprint.css.counters import CounterStyle
+from weasyprint.document import Document, DocumentMetadata, Page
+from weasyprint.formatting_structure.build import build_formatting_structure
+from weasyprint.html import get_html_metadata
+from weasyprint.layout import layout_document
+from weasyprint.pdf import generate_pdf
+from weasyprint.text.fonts import FontConfiguration
+
+from ..testing_utils import resource_path
+from .documents import DOCUMENTS
+
+STEPS = ('parse', 'cascade', 'boxes', 'layout', 'draw', 'write')
+
+PARSER = argparse.ArgumentParser(
+    prog='python -m tests.benchmarks',
+    description='Measure time and memory needed by each rendering step.')
+PARSER.add_argument(
+    'documents', nargs='*',
+    help=f'names of rendered documents among {", ".join(DOCUMENTS)}, '
+    'or import to measure import time, all benchmarks by default')
+PARSER.add_argument(
+    '-s', '--size', type=int, help='amount of content in documents')
+PARSER.add_argument(
+    '-r', '--repeat', type=int, default=3,
+    help='number of renderings used to measure time, best one is kept')
+PARSER.add_argument(
+    '-O', '--options', type=json.loads, default={},
+    help='rendering options, as a JSON object')
+PARSER.add_argument(
+    '-o', '--output', help='filename where results are stored as JSON')
+PARSER.add_argument(
+    '-c', '--compare', help='filename of JSON results compared to new ones')
+PARSER.add_argument(
+    '--no-memory', action='store_false', dest='memory',
+    help='don’t measure peak memory, faster')
+
+
+def render_steps(string, base_url, options):
+    """Render HTML string to PDF, yield the name of each finished step."""
+    font_config = FontConfiguration()
+    counter_style = CounterStyle()
+
+    html = HTML(string=string, base_url=base_url)
+    yield 'parse'
+
+    context = Document._build_layout_context(
+        html, font_config, counter_style, options)
+    yield 'cascade'
+
+    root_box = build_formatting_structure(
+        html.etree_element, context.style_for, context.get_image_from_uri,
+        html.base_url, context.target_collector, counter_style,
+        context.footnotes)
+    yield 'boxes'
+
+    pages = [Page(page_box) for page_box in layout_document(html, root_box, context)]
+    document = Document(
+        pages, DocumentMetadata(**get_html_metadata(html)), html.url_fetcher,
+        font_config)
+    document._html = html
+    yield 'layout'
+
+    pdf = generate_pdf(document, None, 1, **options)
+    yield 'draw'
+
+    pdf.write(
+        io.BytesIO(), options['pdf_version'], options['pdf_identifier'],
+        not options['uncompressed_pdf'])
+    yield 'write'
+
+
+def measure(string, base_url, options, memory=False):
+    """Render HTML string, return time and peak memory used by each step."""
+    results = {}
+    if memory:
+        tracemalloc.start()
+    try:
+        start = perf_counter()
+        for step in render_steps(string, base_url, options):
+            results[step] = {'time': perf_counter() - start}
+            if memory:
+                results[step]['memory'] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.reset_peak()
+            start = perf_counter()
+    finally:
+        if memory:
+            tracemalloc.stop()
+    return results
+
+
+def benchmark(name, size=None, repeat=3, options=None, memory=True):
+    """Measure steps for given document, keep best time of each step."""
+    generator = DOCUMENTS[name]
+    string = generator() if size is None else generator(size)
+    base_url = resource_path('<inline HTML>')
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    results = {step: {'time': float('inf')} for step in STEPS}
+    for _ in range(repeat):
+        for step, values in measure(string, base_url, options).items():
+            results[step]['time'] = min(results[step]['time'], values['time'])
+    if memory:
+        for step, values in measure(string, base_url, options, True).items():
+            results[step]['memory'] = values['memory']
+    return results
+
+
+def import_time(repeat=3, memory=True):
+    """Measure time and memory needed to import WeasyPrint."""
+    code = (
+        'import sys, time, tracemalloc\n'
+        'if sys.argv[1] == "memory": tracemalloc.start()\n'
+        'start = time.perf_counter()\n'
+        'import weasyprint.__main__\n'
+        'print(time.perf_counter() - start, tracemalloc.get_traced_memory()[1])')
+    times = []
+    for _ in range(repeat):
+        output = subprocess.check_output((sys.executable, '-c', code, 'time'))
+        times.append(float(output.split()[0]))
+    results = {'time': min(times)}
+    if memory:
+        output = subprocess.check_output((sys.executable, '-c', code, 'memory'))
+        results['memory'] = int(output.split()[1])
+    return {'import': results}
+
+
+def _format_line(document, step, values, reference=None):
+    line = f'{document:<14}{step:<10}{values["time"]:>10.3f}'
+    if 'memory' in values:
+        line += f'{values["memory"] / 1024 / 1024:>12.1f}'
+    else:
+        line += f'{"":>12}'
+    if reference:
+        ratio = values['time'] / reference['time'] - 1 if reference['time'] else 0
+        line += f'{reference["time"]:>10.3f}{ratio:>+9.1%}'
+    return line
+
+
+def main(argv=None, stdout=None):
+    """Run benchmarks, print and store results."""
+    args = PARSER.parse_args(argv)
+    for name in args.documents:
+        if name != 'import' and name not in DOCUMENTS:
+            PARSER.error(f'unknown document: {name}')
+    stdout = stdout or sys.stdout
+    reference = {}
+    if args.compare:
+        with open(args.compare) as fd:
+            reference = json.load(fd)['results']
+
+    header = f'{"document":<14}{"step":<10}{"time (s)":>10}{"memory (MiB)":>12}'
+    if reference:
+        header += f'{"before":>10}{"change":>9}'
+    print(header, file=stdout)
+
+    results = {}
+    for name in args.documents or ('import', *DOCUMENTS):
+        if name == 'import':
+            results[name] = import_time(args.repeat, args.memory)
+        else:
+            results[name] = benchmark(
+                name, args.size, args.repeat, args.options, args.memory)
+        reference_steps = reference.get(name, {})
+        for step, values in results[name].items():
+            line = _format_line(name, step, values, reference_steps.get(step))
+            print(line, file=stdout)
+        total = {'time': sum(values['time'] for values in results[name].values())}
+        reference_total = None
+        if reference_steps:
+            reference_total = {'time': sum(
+                values['time'] for values in reference_steps.values())}
+        print(_format_line(name, 'total', total, reference_total), file=stdout)
+
+    if args.output:
+        with open(args.output, 'w') as fd:
+            json.dump({
+                'weasyprint': VERSION,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'size': args.size,
+                'repeat': args.repeat,
+                'options': args.options,
+                'results': results,
+            }, fd, indent=2)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
@@ -0,0 +1,213 @@
+"""Generators of documents used by benchmarks.
+
+Each generator returns an HTML string. Its ``size`` parameter sets the amount
+of content, default values give documents rendered in a few seconds.
+
+"""
+
+from itertools import cycle, islice
+
+LOREM = (
+    'Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod '
+    'tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim '
+    'veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea '
+    'commodo consequat. Duis aute irure dolor in reprehenderit in voluptate '
+    'velit esse cillum dolore eu fugiat nulla pariatur. Excepteur sint '
+    'occaecat cupidatat non proident, sunt in culpa qui officia deserunt '
+    'mollit anim id est laborum.')
+
+CJK = (
+    '吾輩は猫である。名前はまだ無い。どこで生れたかとんと見当がつかぬ。'
+    '何でも薄暗いじめじめした所でニャーニャー泣いていた事だけは記憶している。'
+    '天下第一的好文章，須經千錘百鍊而成。한국어 문장도 함께 배치합니다.')
+
+
+def _words(count, words=LOREM.split()):
+    return ' '.join(islice(cycle(words), count))
+
+
+def long_text(size=200):
+    """Justified and hyphenated paragraphs with headings and footnotes."""
+    sections = []
+    for i in range(size):
+        sections.append(
+            f'<h2>Section {i}</h2>'
+            f'<p>{_words(120)}<span class="note">{_words(12)}</span></p>'
+            f'<p><em>{_words(20)}</em> {_words(80)} <a href="#s{i}">link</a></p>')
+    return f'''
+      <html lang="en">
+      <style>
+        @page {{ size: A4; margin: 2cm; @bottom-center {{ content: counter(page) }} }}
+        body {{ font-size: 11pt; text-align: justify; hyphens: auto }}
+        h2 {{ break-after: avoid; bookmark-level: 2 }}
+        .note {{ float: footnote }}
+      </style>
+      {''.join(sections)}
+    '''
+
+
+def huge_table(size=2000):
+    """Long table with header and footer repeated on each page."""
+    head = ''.join(f'<th>Column {i}</th>' for i in range(8))
+    rows = ''.join(
+        '<tr>' + ''.join(
+            f'<td>{row * column}</td>' if column % 2 else
+            f'<td>{_words(row % 5 + 1)}</td>' for column in range(8)) + '</tr>'
+        for row in range(size))
+    return f'''
+      <style>
+        @page {{ size: A4 landscape; margin: 1cm }}
+        table {{ border-collapse: collapse; width: 100% }}
+        td, th {{ border: 1px solid; padding: 2px 4px }}
+        tr:nth-child(odd) {{ background: #eee }}
+        td:nth-child(even) {{ text-align: right }}
+      </style>
+      <table>
+        <thead><tr>{head}</tr></thead>
+        <tfoot><tr>{head}</tr></tfoot>
+        <tbody>{rows}</tbody>
+      </table>
+    '''
+
+
+def deep_nesting(size=50, depth=40):
+    """Deeply nested blocks with margins, borders and inherited properties."""
+    nested = 'text'
+    for i in range(depth):
+        nested = f'<div class="level-{i % 4}">{_words(3)} {nested}</div>'
+    return f'''
+      <style>
+        div {{ margin: 1px 2px; padding: 1px; border-left: 1px solid }}
+        .level-0 {{ color: navy }}
+        .level-1 {{ font-style: italic }}
+        .level-2 {{ background: #f4f4f4 }}
+        .level-3 {{ font-size: 99% }}
+      </style>
+      {nested * size}
+    '''
+
+
+def floats(size=300):
+    """Many left and right floats with text flowing around them."""
+    paragraphs = ''.join(
+        f'<div class="{"left" if i % 2 else "right"}" '
+        f'style="height: {20 + i % 7 * 10}px"></div>'
+        f'<p>{_words(40 + i % 30)}</p>' + ('<p class="clear"></p>' * (i % 9 == 0))
+        for i in range(size))
+    return f'''
+      <style>
+        .left, .right {{ width: 20%; background: #ccc; margin: 4px }}
+        .left {{ float: left }}
+        .right {{ float: right }}
+        .clear {{ clear: both }}
+      </style>
+      {paragraphs}
+    '''
+
+
+def dashboard(size=40):
+    """Pages of grid and flex cards, with badges and wrapped text."""
+    card = '''
+      <section class="card">
+        <header><h3>Metric {i}</h3><span class="badge">{i}%</span></header>
+        <div class="values">{values}</div>
+        <p>{text}</p>
+      </section>'''
+    cards = ''.join(
+        card.format(
+            i=i, text=_words(15 + i % 20), values=''.join(
+                f'<span style="flex-grow: {j + 1}">{i * j}</span>'
+                for j in range(5)))
+        for i in range(size * 6))
+    return f'''
+      <style>
+        @page {{ size: A4; margin: 1cm }}
+        body {{ display: grid; grid-template-columns: repeat(3, 1fr); gap: 8px;
+                font-family: sans-serif; font-size: 9pt }}
+        .card {{ border: 1px solid #999; border-radius: 4px; padding: 4px;
+                 break-inside: avoid }}
+        header {{ display: flex; justify-content: space-between;
+                  align-items: center }}
+        .badge {{ background: #def; border-radius: 8px; padding: 0 4px }}
+        .values {{ display: flex; flex-wrap: wrap; gap: 2px }}
+        .values span {{ background: #eee; text-align: center }}
+      </style>
+      {cards}
+    '''
+
+
+def svg(size=200):
+    """Inline and external SVG images with paths, gradients and text."""
+    inline = '''
+      <svg width="120" height="80" viewBox="0 0 120 80">
+        <defs>
+          <linearGradient id="gradient-{i}">
+            <stop offset="0" stop-color="blue" /><stop offset="1" stop-color="red" />
+          </linearGradient>
+        </defs>
+        <rect width="120" height="80" fill="url(#gradient-{i})" />
+        <path d="M 10 70 Q 30 {y} 60 40 T 110 10" stroke="black" fill="none" />
+        <circle cx="{x}" cy="40" r="10" fill-opacity="0.5" />
+        <text x="10" y="20" font-size="10">Chart {i}</text>
+      </svg>'''
+    images = ''.join(
+        inline.format(i=i, x=i % 100 + 10, y=i % 70) +
+        '<img src="pattern.svg" style="width: 40px">'
+        '<img src="pattern-transparent.svg" style="width: 40px">'
+        for i in range(size))
+    return f'<style>svg {{ margin: 2px }}</style>{images}'
+
+
+def images(size=300):
+    """Raster images with various formats, sizes and transparencies."""
+    names = cycle((
+        'pattern.png', 'blue.jpg', 'pattern.gif', 'pattern.palette.png',
+        'logo_small.png', 'icon.png', 'not-optimized.jpg'))
+    return ''.join(
+        f'<img src="{name}" style="width: {10 + i % 50}px; '
+        f'image-rendering: {"pixelated" if i % 3 else "auto"}">'
+        for i, name in zip(range(size), names))
+
+
+def cjk(size=300):
+    """Chinese, Japanese and Korean text, horizontal with line breaks."""
+    paragraphs = ''.join(
+        f'<p lang="{("ja", "zh", "ko")[i % 3]}">{CJK * (1 + i % 4)}</p>'
+        for i in range(size))
+    return f'''
+      <style>
+        body {{ font-family: "Noto Sans CJK JP", "Noto Sans CJK SC", sans-serif;
+                line-break: strict; text-align: justify }}
+      </style>
+      {paragraphs}
+    '''
+
+
+def selectors(size=300, rules=500):
+    """Articles styled by a framework-sized stylesheet of descendant rules."""
+    components = ('navbar', 'card', 'modal', 'dropdown', 'alert', 'table')
+    stylesheet = ''.join(
+        f'.{components[i % 6]}-{i} .item > span, '
+        f'#{components[i % 6]} ul li.active-{i} a {{ color: #{i:03x} }}\n'
+        f'article .body p.lead-{i % 50} em {{ font-weight: bold }}\n'
+        for i in range(rules))
+    articles = ''.join(
+        f'<article class="card-{i % 50}"><div class="body">'
+        f'<p class="lead-{i % 50}">{_words(20)} <em>{_words(3)}</em></p>'
+        f'<ul><li><a href="#a{i}">{_words(2)}</a></li></ul>'
+        f'<p><span>{_words(30)}</span></p></div></article>'
+        for i in range(size))
+    return f'<style>{stylesheet}</style>{articles}'
+
+
+DOCUMENTS = {
+    'long_text': long_text,
+    'huge_table': huge_table,
+    'deep_nesting': deep_nesting,
+    'floats': floats,
+    'dashboard': dashboard,
+    'svg': svg,
+    'images': images,
+    'cjk': cjk,
+    'selectors': selectors,
+}
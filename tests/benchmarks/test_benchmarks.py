@@ -0,0 +1,39 @@
+"""Test that benchmarks run."""
+
+import io
+import json
+
+import pytest
+
+from . import __main__
+from .documents import DOCUMENTS
+
+
+@pytest.mark.parametrize('name', DOCUMENTS)
+def test_benchmark(name):
+    results = __main__.benchmark(name, size=1, repeat=1)
+    assert tuple(results) == __main__.STEPS
+    for values in results.values():
+        assert values['time'] >= 0
+        assert values['memory'] > 0
+
+
+def test_import_time():
+    results = __main__.import_time(repeat=1)
+    assert results['import']['time'] > 0
+    assert results['import']['memory'] > 0
+
+
+def test_benchmark_command_line(tmp_path):
+    output = tmp_path / 'results.json'
+    options = ['--size', '1', '--repeat', '1', '--no-memory']
+    __main__.main(['long_text', 'svg', *options, '-o', str(output)], io.StringIO())
+    results = json.loads(output.read_text())['results']
+    assert set(results) == {'long_text', 'svg'}
+    assert 'memory' not in results['svg']['write']
+
+    stdout = io.StringIO()
+    __main__.main(['svg', *options, '--compare', str(output)], stdout)
+    header, *lines = stdout.getvalue().splitlines()
+    assert header.split()[-2:] == ['before', 'change']
+    assert len(lines) == len(__main__.STEPS) + 1
@@ -3,7 +3,8 @@
 import pytest
 
 from weasyprint import CSS, default_url_fetcher
-from weasyprint.css import find_stylesheets, get_all_computed_styles
+from weasyprint.css import StyleFor, find_stylesheets, get_all_computed_styles
+from weasyprint.css.computed_values import CHARACTER_RATIOS
 from weasyprint.urls import path2url
 
 from ..testing_utils import (  # isort:skip
@@ -162,6 +163,188 @@ def test_important():
         assert paragraph.style['color'] == (0, 1, 0, 1)  # lime (light green)
 
 
+@assert_no_logs
+def test_style_sharing():
+    document = FakeHTML(string='''
+      <style>
+        td { color: blue }
+        td.red { color: red }
+        .note { float: footnote }
+      </style>
+      <table>
+        <tr><td>a</td><td>b</td><td class="red">c</td><td id="d">d</td></tr>
+        <tr><td>e</td><td style="color: red">f</td></tr>
+      </table>
+      <p>1<span class="note">a</span> 2<span class="note">b</span></p>
+    ''')
+    style_for = get_all_computed_styles(document)
+    body = document.etree_element[1]
+    table, p = body
+    tbody, = table
+    (a, b, c, d), (e, f) = tbody
+    span1, span2 = p
+
+    # Siblings and cousins with the same declarations share their style.
+    assert style_for(a) is style_for(b) is style_for(e)
+    assert style_for(span1) is style_for(span2)
+
+    # Different declarations or attributes give different styles.
+    assert style_for(c) is not style_for(a)
+    assert style_for(c)['color'] == (1, 0, 0, 1)
+    assert style_for(d) is not style_for(a)
+    assert style_for(d)['anchor'] == 'd'
+    assert style_for(f) is not style_for(a)
+    assert style_for(f)['color'] == (1, 0, 0, 1)
+
+    # Shared styles are not changed by the layout.
+    page, = document.render().pages
+    _html, footnote_area = page._page_box.children
+    assert len(footnote_area.children) == 2
+    assert style_for(span1)['float'] == 'footnote'
+
+
+@assert_no_logs
+def test_hidden_subtree_styles():
+    document = FakeHTML(string='''
+      <style>
+        .hidden { display: none }
+        .hidden p { font-size: 20px }
+      </style>
+      <section class="hidden">
+        <p style="color: blue"><em>a</em></p>
+      </section>
+      <p>b</p>
+    ''')
+    style_for = get_all_computed_styles(document)
+    body = document.etree_element[1]
+    section, _p = body
+    p, = section
+    em, = p
+
+    # Styles of elements in hidden subtrees are not computed…
+    computed_styles = style_for.get_computed_styles()
+    assert (section, None) in computed_styles
+    assert (p, None) not in computed_styles
+    assert (em, None) not in computed_styles
+
+    # … until they are requested.
+    assert style_for(em)['color'] == (0, 0, 1, 1)
+    assert style_for(em)['font_size'] == 20
+    assert style_for(em)['font_style'] == 'italic'
+    assert style_for(p)['color'] == (0, 0, 1, 1)
+
+
+@assert_no_logs
+def test_ancestor_filter():
+    document = FakeHTML(string='''
+      <style>
+        section.main p { color: red }
+        #intro > p { font-weight: bold }
+        aside + section p { font-style: italic }
+        .missing p, article p { color: blue }
+      </style>
+      <aside></aside>
+      <section class="main" id="intro"><p>a</p><div><p>b</p></div></section>
+      <section><p>c</p></section>
+    ''')
+    style_for = get_all_computed_styles(document)
+    body = document.etree_element[1]
+    aside, main, section = body
+    a, div = main
+    b, = div
+    c, = section
+
+    assert style_for(a)['color'] == style_for(b)['color'] == (1, 0, 0, 1)
+    assert style_for(a)['font_weight'] == 700
+    assert style_for(b)['font_weight'] == 400
+    assert style_for(a)['font_style'] == 'italic'
+    assert style_for(c)['font_style'] == 'normal'
+    assert style_for(c)['color'] == (0, 0, 0, 1)
+
+
+@assert_no_logs
+def test_cascade_processes(monkeypatch):
+    monkeypatch.setattr('weasyprint.css.CASCADE_PROCESSES_MIN_ELEMENTS', 0)
+    html = '''
+      <style>
+        section p { color: red }
+        .odd > p, #s3 em { font-weight: bold }
+        p::before { content: 'a' }
+        .hidden { display: none }
+      </style>
+    ''' + ''.join(
+        f'<section id="s{i}" class="{"odd" if i % 2 else "even"}">'
+        f'<p>{i} <em>text</em></p><div class="hidden"><p>x</p></div></section>'
+        for i in range(20))
+    document, parallel_document = FakeHTML(string=html), FakeHTML(string=html)
+    style_for = get_all_computed_styles(document)
+    parallel_matches = []
+    match_in_processes = StyleFor._match_in_processes
+
+    def recording_match_in_processes(*args):
+        parallel_matches.append(match_in_processes(*args))
+        return parallel_matches[-1]
+
+    monkeypatch.setattr(
+        StyleFor, '_match_in_processes', recording_match_in_processes)
+    parallel_style_for = get_all_computed_styles(parallel_document, processes=2)
+    # Selectors have been matched by processes for all the elements in body.
+    matches, = parallel_matches
+    body = parallel_document.etree_element[1]
+    assert len(matches) == sum(1 for _ in body.iter()) - 1
+    elements = zip(
+        document.etree_element.iter(), parallel_document.etree_element.iter())
+    for element, parallel_element in elements:
+        for pseudo_type in (None, 'before'):
+            style = style_for(element, pseudo_type)
+            parallel_style = parallel_style_for(parallel_element, pseudo_type)
+            if style is None:
+                assert parallel_style is None
+                continue
+            for key in ('display', 'color', 'font_weight', 'content'):
+                assert style[key] == parallel_style[key]
+
+
+@assert_no_logs
+def test_computed_style_compact():
+    document = FakeHTML(string='<p style="color: blue"><em>a</em></p>')
+    page, = document.render().pages
+    html, = page._page_box.children
+    body, = html.children
+    paragraph, = body.children
+    line, = paragraph.children
+    em, = line.children
+    for style in (paragraph.style, line.style, em.style):
+        assert not hasattr(style, '__dict__')
+        assert style['color'] == (0, 0, 1, 1)
+        assert style['margin_left'] == (0, 'px')
+        assert 'margin_left' not in style
+        assert not style.specified or style.specified is style
+        copy = style.copy()
+        assert copy == style
+        assert copy.parent_style is style.parent_style
+        assert copy['color'] == (0, 0, 1, 1)
+    assert 'color' in paragraph.style
+    assert 'color' not in line.style
+    assert 'color' not in em.style
+    assert em.style['font_style'] == 'italic'
+    assert 'font_style' in em.style
+
+
+@assert_no_logs
+def test_computed_style_specified():
+    document = FakeHTML(string='''
+      <div style="float: left; position: absolute; display: inline"></div>
+    ''')
+    page, = document.render().pages
+    html, = page._page_box.children
+    body, = html.children
+    div, = body.children
+    assert div.style['float'] == 'none'
+    assert div.style['display'] == ('block', 'flow')
+    assert div.style.specified == {'float': 'left', 'display': ('inline', 'flow')}
+
+
 @assert_no_logs
 @pytest.mark.parametrize('value, width', (
     ('96px', 96),
@@ -188,6 +371,23 @@ def test_units(value, width):
     assert p.margin_left == width
 
 
+@assert_no_logs
+def test_character_ratio_cache():
+    # Ratios of ch and ex units are shared by documents.
+    margins = []
+    for font_size in (10, 20, 10):
+        document = FakeHTML(string=f'''
+          <body style="font: {font_size}px serif">
+          <p style="margin-left: 2ch; margin-right: 3ex"></p>''')
+        page, = document.render().pages
+        html, = page._page_box.children
+        body, = html.children
+        p, = body.children
+        margins.append((p.margin_left / font_size, p.margin_right / font_size))
+    assert margins[0] == pytest.approx(margins[1]) == pytest.approx(margins[2])
+    assert {character for character, _ in CHARACTER_RATIOS} == {'0', 'x'}
+
+
 @pytest.mark.parametrize('media, width, warning', (
     ('@media screen { @page { size: 10px } }', 20, False),
     ('@media print { @page { size: 10px } }', 10, False),
@@ -63,6 +63,25 @@ def test_target_counter_attr():
     assert before.text == 'c'
 
 
+@assert_no_logs
+def test_target_counter_hidden():
+    # Anchors in subtrees not displayed are found, no error is logged.
+    page, = render_pages('''
+      <style>
+        div { counter-increment: div }
+        #id1::before { content: target-counter('#id3', div) }
+        section { display: none }
+      </style>
+      <body>
+        <div id="id1"></div>
+        <section><div id="id2"><div id="id3"></div></div></section>
+    ''')
+    html, = page.children
+    body, = html.children
+    div1, = body.children
+    assert div1.element_tag == 'div'
+
+
 @assert_no_logs
 def test_target_counters():
     page, = render_pages('''
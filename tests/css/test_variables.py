@@ -139,6 +139,56 @@ def test_variable_chain_root():
     assert html.width == 10
 
 
+@assert_no_logs
+def test_variable_chain_inherited():
+    # Variables are substituted in custom properties where they are defined.
+    page, = render_pages('''
+      <style>
+        body { --size: 10px; --width: var(--size) }
+        p { --size: 20px; width: var(--width) }
+      </style>
+      <p></p>
+    ''')
+    html, = page.children
+    body, = html.children
+    paragraph, = body.children
+    assert paragraph.width == 10
+
+
+@assert_no_logs
+def test_variable_self_default():
+    page, = render_pages('''
+      <style>
+        p { --var: var(--var); width: var(--var, 10px) }
+      </style>
+      <p></p>
+    ''')
+    html, = page.children
+    body, = html.children
+    paragraph, = body.children
+    assert paragraph.width == 10
+
+
+@assert_no_logs
+def test_variable_solved_once():
+    page, = render_pages('''
+      <style>
+        html { --var: 10px }
+        p { width: var(--var) }
+        div { --var: 20px }
+      </style>
+      <p></p><p></p><div><p></p><p></p></div>
+    ''')
+    html, = page.children
+    body, = html.children
+    paragraph1, paragraph2, div = body.children
+    paragraph3, paragraph4 = div.children
+    assert paragraph1.width == paragraph2.width == 10
+    assert paragraph3.width == paragraph4.width == 20
+    pending = paragraph1.style.cascaded['width'][0]
+    assert len(pending._solved) == 2
+
+
 def test_variable_self():
     page, = render_pages('''
       <style>
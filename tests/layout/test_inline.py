@@ -1116,3 +1116,71 @@ def test_nested_waiting_children_width():
     assert line1.children[0].children[0].children[0].text == 'a'
     assert line2.children[0].children[0].children[0].text == 'b'
     assert line2.children[0].children[1].text == 'c'
+
+
+@assert_no_logs
+@pytest.mark.parametrize('width', ('120px', '10em', '333px'))
+def test_paragraph_lines(width):
+    # Lines taken from the layout of the whole paragraph are the same as lines
+    # laid out one by one, as with letter-spacing.
+    text = ' '.join(
+        ('Lorem', 'ipsum', 'dolor', 'sit', 'amet,', 'consectetur',
+         'adipiscing', 'elit,', 'sed', 'do', 'eiusmod', 'tempor') * 8)
+    lines_texts = []
+    for letter_spacing in ('normal', '0'):
+        page, = render_pages(f'''
+          <p style="width: {width}; font-family: {SANS_FONTS};
+                    letter-spacing: {letter_spacing}">{text}</p>
+        ''')
+        html, = page.children
+        body, = html.children
+        paragraph, = body.children
+        assert len(paragraph.children) > 4
+        lines_texts.append([
+            line.children[0].text for line in paragraph.children])
+        for line in paragraph.children:
+            assert line.children[0].width <= line.width
+    assert lines_texts[0] == lines_texts[1]
+    assert ''.join(lines_texts[0]).replace(' ', '') == text.replace(' ', '')
+
+
+@assert_no_logs
+def test_text_metrics_cache():
+    # Repeated texts reuse cached metrics, but keep their own layouts.
+    page, = render_pages('''
+      <style>p { font-family: weasyprint; font-size: 2px; line-height: 1 }</style>
+      <p>abc</p>
+      <p>abc def</p>
+      <p>abc</p>
+      <p style="width: 7px">abc def</p>
+    ''')
+    html, = page.children
+    body, = html.children
+    texts = [
+        [line.children[0] for line in paragraph.children]
+        for paragraph in body.children]
+    assert [[text.text for text in lines] for lines in texts] == [
+        ['abc'], ['abc def'], ['abc'], ['abc', 'def']]
+    assert texts[0][0].width == texts[2][0].width == 6
+    assert texts[0][0].pango_layout is not texts[2][0].pango_layout
+
+
+@assert_no_logs
+def test_paragraph_lines_overflow():
+    # Lines of paragraphs wider than the available width keep their text.
+    text = ' '.join(('Lorem ipsum dolor sit amet',) * 12)
+    word = 'pneumonoultramicroscopicsilicovolcanoconiosis'
+    page, = render_pages(f'''
+      <p style="width: 100px; font-family: {SANS_FONTS}">{text} {word}</p>
+    ''')
+    html, = page.children
+    body, = html.children
+    paragraph, = body.children
+    assert len(paragraph.children) > 4
+    for line in paragraph.children:
+        text_box, = line.children
+        assert text_box.pango_layout.text.strip()
+    text_box, = paragraph.children[-1].children
+    assert text_box.text == word
+    assert text_box.pango_layout.text.strip() == word
+    assert text_box.width > 100
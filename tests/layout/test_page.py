@@ -1556,6 +1556,38 @@ def test_running_elements(argument, texts):
             assert not text
 
 
+@assert_no_logs
+def test_running_elements_shared_style():
+    # Running elements with the same style stay running once one is displayed.
+    pages = render_pages('''
+      <style>
+        @page {
+          margin: 50px;
+          size: 200px;
+          @bottom-center { content: element(title) }
+        }
+        article { break-after: page }
+        h1 { position: running(title) }
+      </style>
+      <article><h1>1</h1><p>a</p></article>
+      <article><h1>2</h1><p>b</p></article>
+      <article><h1>3</h1><p>c</p></article>
+      <article><h1>4</h1><p>d</p></article>
+    ''')
+    assert len(pages) == 4
+    for i, page in enumerate(pages, start=1):
+        html, margin = page.children
+        body, = html.children
+        article, = body.children
+        paragraph, = article.children
+        assert paragraph.element_tag == 'p'
+        h1, = margin.children
+        assert h1.style['position'] == 'static'
+        line, = h1.children
+        textbox, = line.children
+        assert textbox.text == str(i)
+
+
 @assert_no_logs
 def test_running_elements_display():
     page, = render_pages('''
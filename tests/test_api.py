@@ -1,12 +1,18 @@
 """Test the public API."""
 
+import base64
 import contextlib
 import gzip
 import io
+import json
 import os
+import pickle
 import re
+import socket
+import subprocess
 import sys
 import threading
+import time
 import unicodedata
 import wsgiref.simple_server
 import zlib
@@ -17,9 +23,13 @@ from urllib.parse import urljoin, uses_relative
 import pytest
 from PIL import Image
 
-from weasyprint import CSS, HTML, __main__, default_url_fetcher
+from weasyprint import CSS, HTML, Renderer, __main__, default_url_fetcher
+from weasyprint.css.bundle import main as compile_css
+from weasyprint.css.counters import CounterStyle
+from weasyprint.document import Document
 from weasyprint.pdf.anchors import resolve_links
 from weasyprint.pdf.metadata import generate_rdf_metadata
+from weasyprint.text.fonts import FontConfiguration
 from weasyprint.urls import path2url
 
 from .draw import parse_pixels
@@ -402,6 +412,7 @@ def test_command_line_render(tmp_path):
         _run('not_optimized.html out20.pdf --full-fonts')
         _run('not_optimized.html out21.pdf --full-fonts --uncompressed-pdf')
         _run(f'not_optimized.html out22.pdf -c {tmp_path}')
+        _run('not_optimized.html out24.pdf --workers 4')
         assert (
             len((tmp_path / 'out18.pdf').read_bytes()) <
             len((tmp_path / 'out17.pdf').read_bytes()) <
@@ -412,7 +423,7 @@ def test_command_line_render(tmp_path):
             len((tmp_path / 'out21.pdf').read_bytes()))
         assert len({
             (tmp_path / f'out{i}.pdf').read_bytes()
-            for i in (15, 22)}) == 1
+            for i in (15, 22, 24)}) == 1
         os.environ.pop('SOURCE_DATE_EPOCH')
 
         stdout = _run('combined.html --uncompressed-pdf -')
@@ -454,6 +465,120 @@ def test_command_line_render(tmp_path):
         _run('--version')
 
 
+def test_command_line_serve(tmp_path):
+    html = '<body style="margin: 0; font-size: 0"><img src=pattern.png>'
+    (tmp_path / 'pattern.png').write_bytes(resource_path('pattern.png').read_bytes())
+    (tmp_path / 'in.html').write_text(html)
+    jobs = [
+        {'id': 1, 'args': ['-', '-'], 'input': html},
+        {'id': 'file', 'args': ['in.html', 'out.pdf', '-p']},
+        ['--unknown-option', 'in.html', 'out.pdf'],
+        {'id': 2, 'args': ['-', '-', '-u', ''], 'input': html},
+    ]
+    stdin = b'\n'.join(json.dumps(job).encode() for job in jobs) + b'\nbad\n'
+    with chdir(tmp_path):
+        pdf_bytes = _run('- -', stdin=html.encode())
+        stdout = _run('--serve', stdin=stdin)
+    responses = {
+        response['id']: response for response in
+        (json.loads(line) for line in stdout.splitlines())}
+    assert len(responses) == 4
+    assert base64.b64decode(responses[1]['output']) == pdf_bytes
+    assert 'error' not in responses[1]
+    assert responses[1]['logs'] == []
+    assert (tmp_path / 'out.pdf').read_bytes().startswith(b'%PDF')
+    assert 'output' not in responses['file']
+    assert responses[None]['error'] in ('invalid arguments', 'invalid job')
+    assert len(responses[2]['logs']) == 1
+    assert responses[2]['logs'][0].startswith(
+        'ERROR: Relative URI reference without a base URI')
+    for response in responses.values():
+        assert response['duration'] >= 0
+
+
+def test_command_line_serve_images(tmp_path):
+    # Images are fetched again for each job.
+    html = '<body style="margin: 0"><img src=image style="width: 4px">'
+    (tmp_path / 'in.html').write_text(html)
+    job = {'args': ['in.html', '-']}
+    outputs = []
+    with chdir(tmp_path):
+        for name in ('pattern.png', 'blue.jpg'):
+            (tmp_path / 'image').write_bytes(resource_path(name).read_bytes())
+            response = __main__.render_job(job, FakeHTML)
+            assert 'error' not in response
+            outputs.append(response['output'])
+    assert outputs[0] != outputs[1]
+
+
+@pytest.mark.parametrize('processes', (1, 2))
+def test_command_line_serve_socket(tmp_path, processes):
+    html = '<p>a</p>'
+    path = tmp_path / 'socket'
+    server = subprocess.Popen((
+        sys.executable, '-m', 'weasyprint', '--serve', str(path),
+        '--processes', str(processes)))
+    try:
+        for _ in range(300):
+            if path.is_socket():
+                break
+            time.sleep(0.1)
+        jobs = [{'id': i, 'args': ['-', '-'], 'input': html} for i in range(4)]
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(str(path))
+            client.sendall(b''.join(json.dumps(job).encode() + b'\n' for job in jobs))
+            client.shutdown(socket.SHUT_WR)
+            with client.makefile('rb') as lines:
+                responses = [json.loads(line) for line in lines]
+    finally:
+        server.terminate()
+        server.wait()
+    assert sorted(response['id'] for response in responses) == [0, 1, 2, 3]
+    for response in responses:
+        assert 'error' not in response
+        assert base64.b64decode(response['output']).startswith(b'%PDF')
+
+
+def test_command_line_serve_parser(tmp_path, capsys):
+    # Parser messages are not printed, renderers follow stylesheet changes.
+    html = '<p>a</p>'
+    jobs = [
+        {'id': 'help', 'args': ['--help']},
+        {'id': 'version', 'args': ['--version']},
+        {'id': 'info', 'args': ['--info']},
+    ]
+    stdin = b'\n'.join(json.dumps(job).encode() for job in jobs)
+    stdout = _run('--serve', stdin=stdin)
+    assert capsys.readouterr().out == ''
+    responses = [json.loads(line) for line in stdout.splitlines()]
+    assert {response['id'] for response in responses} == {
+        'help', 'version', 'info'}
+    for response in responses:
+        assert response['error'] == 'invalid arguments'
+
+    job = {'id': 1, 'args': ['-s', 'style.css', '-', '-'], 'input': html}
+    with chdir(tmp_path):
+        for size in (10, 20):
+            (tmp_path / 'style.css').write_text(f'@page {{ size: {size}px }}')
+            pdf_bytes = _run('-s style.css - -', stdin=html.encode())
+            stdout = _run('--serve', stdin=json.dumps(job).encode())
+            response = json.loads(stdout)
+            assert base64.b64decode(response['output']) == pdf_bytes
+
+
+def test_lazy_imports():
+    # Slow modules and stylesheets are only loaded when needed.
+    code = (
+        'import sys, weasyprint.__main__\n'
+        'print(*(name for name in sys.modules if name.split(".")[0] in '
+        '("fontTools", "PIL") or name.startswith("weasyprint.svg")))\n'
+        'print(*(name for name in vars(weasyprint.html) if "STYLESHEET" in name))')
+    modules, stylesheets = subprocess.check_output(
+        (sys.executable, '-c', code), text=True).splitlines()
+    assert not modules
+    assert not stylesheets
+
+
 @pytest.mark.parametrize('version, pdf_version', (
     (1, '1.4'),
     (2, '1.7'),
@@ -702,6 +827,57 @@ def test_low_level_api(assert_pixels_equal):
     assert _png_size(document.copy([page_2]).write_png()) == (6, 4)
 
 
+@assert_no_logs
+@pytest.mark.parametrize('content', (
+    'counter(page)',
+    'counter(page) "/" counter(pages)',
+))
+def test_render_iter(content):
+    html = FakeHTML(string='''
+        <style>
+            @page { size: 20px; @top-center { content: %s } }
+            p { break-before: page }
+        </style>
+        <p>a</p><p>b</p><p>c</p>
+    ''' % content)
+    pages = html.render_iter()
+    page = next(pages)
+    assert (page.width, page.height) == (20, 20)
+    pages = [page, *pages]
+    document = html.render()
+    assert len(pages) == len(document.pages) == 3
+    assert document.copy(pages).write_pdf() == document.write_pdf()
+    assert all(page.font_config is pages[0].font_config for page in pages)
+    exported = Document(
+        pages, document.metadata, document.url_fetcher, pages[0].font_config)
+    assert exported.write_pdf() == document.write_pdf()
+
+
+@assert_no_logs
+def test_metrics():
+    events = []
+    html = FakeHTML(string='''
+        <style>@page { size: 20px; @top-center { content: counter(pages) } }</style>
+        <p style="break-after: page">a</p><p>b</p>
+    ''')
+    html.write_pdf(metrics=events.append)
+    stages = [event['stage'] for event in events if event['event'] == 'start']
+    assert stages[:3] == ['cascade', 'boxes', 'layout']
+    assert stages.count('layout.page') == 2
+    assert stages.count('pdf.page') == 2
+    assert 'layout.pagination' in stages
+    assert 'pdf.font' in stages
+    assert stages[-1] == 'write'
+    for event in events:
+        assert (event['event'] == 'end') == ('duration' in event)
+        if event['event'] == 'end':
+            assert event['duration'] >= 0
+            if event['stage'] == 'layout':
+                assert event['pages'] == 2
+            elif event['stage'] == 'boxes':
+                assert event['boxes'] > 0
+
+
 @pytest.mark.parametrize('html, expected_by_page, expected_tree, round', (
     ('''
         <style>h1, h2, h3, h4 { height: 10px }</style>
@@ -1311,3 +1487,169 @@ def test_page_copy_relative():
     duplicated_pages = document.copy([*document.pages, *document.pages])
     pngs = duplicated_pages.write_png(split_images=True)
     assert pngs[0] == pngs[1]
+
+
+@assert_no_logs
+def test_stylesheet_cache():
+    html = '''
+      <style>
+        @font-face { src: url(weasyprint.otf); font-family: weasyprint-cache }
+        @counter-style letters { system: alphabetic; symbols: a b }
+        @page { size: 20px 30px }
+        p { font-family: weasyprint-cache; display: list-item;
+            list-style: inside letters }
+      </style>
+      <style>@import url(sheet2.css)</style>
+      <p>abc</p><p>def</p>
+    '''
+    base_url = resource_path('<inline HTML>')
+    reference = FakeHTML(string=html, base_url=base_url).write_pdf()
+    cache = {}
+    for _ in range(2):
+        document = FakeHTML(string=html, base_url=base_url).render(
+            stylesheet_cache=cache)
+        assert (document.pages[0].width, document.pages[0].height) == (20, 30)
+        assert document.write_pdf() == reference
+        # Stylesheets including @import rules are not cached.
+        assert len(cache) == 1
+
+
+@assert_no_logs
+def test_stylesheet_bundle(tmp_path):
+    stylesheet = tmp_path / 'print.css'
+    stylesheet.write_text('''
+      @font-face { src: url(weasyprint.otf); font-family: weasyprint-bundle }
+      @counter-style letters { system: alphabetic; symbols: a b }
+      @page { size: 20px 30px; @top-left { content: 'a' } }
+      @media screen { p { color: blue } }
+      section > p { font-family: weasyprint-bundle; display: list-item;
+                    list-style: inside letters; color: var(--color, red) }
+      .missing p, p::after { content: 'b' }
+    ''')
+    base_url = resource_path('<inline HTML>')
+    html = '<section><p>abc</p><p>def</p></section>'
+
+    def render(css_factory):
+        font_config, counter_style = FontConfiguration(), CounterStyle()
+        css = css_factory(font_config=font_config, counter_style=counter_style)
+        return FakeHTML(string=html).render(
+            stylesheets=[css], font_config=font_config,
+            counter_style=counter_style)
+
+    reference = render(partial(CSS, filename=stylesheet, base_url=base_url))
+    bundle = tmp_path / 'print.bundle'
+    compile_css([str(bundle), str(stylesheet), '--base-url', base_url])
+    document = render(partial(CSS.from_bundle, bundle))
+    assert (document.pages[0].width, document.pages[0].height) == (20, 30)
+    assert document.write_pdf() == reference.write_pdf()
+
+    with bundle.open('wb') as fd:
+        pickle.dump({'version': '0.1'}, fd)
+    with pytest.raises(ValueError):
+        CSS.from_bundle(bundle)
+
+
+def test_prefetch():
+    html = '''
+      <style>
+        @page { size: 20px }
+        body { margin: 0; font-size: 0 }
+        div { background: url(logo_small.png) }
+        p::before { content: url(blue.jpg) }
+        .hidden { display: none }
+      </style>
+      <img src="pattern.png"><img src="pattern.png">
+      <div></div><p></p>
+      <section class="hidden"><img src="pattern.gif"></section>
+      <img src="missing.png">
+    '''
+    base_url = resource_path('<inline HTML>')
+    fetched_urls = []
+
+    def fetcher(url):
+        fetched_urls.append(url)
+        return default_url_fetcher(url)
+
+    with capture_logs():
+        reference = FakeHTML(string=html, base_url=base_url).write_png()
+    events = []
+    with capture_logs() as logs:
+        document = FakeHTML(
+            string=html, base_url=base_url, url_fetcher=fetcher).render(
+                prefetch=2, metrics=events.append)
+    assert len(logs) == 1
+    assert 'missing.png' in logs[0]
+    assert document.write_png() == reference
+    assert sorted(url.rsplit('/', 1)[-1] for url in fetched_urls) == [
+        'blue.jpg', 'logo_small.png', 'missing.png', 'missing.png',
+        'pattern.png']
+    prefetch_event, = (
+        event for event in events
+        if event['stage'] == 'prefetch' and event['event'] == 'end')
+    assert prefetch_event['urls'] == 4
+
+
+@assert_no_logs
+def test_renderer():
+    path = resource_path('pattern.png')
+    fetched_urls = []
+
+    def fetcher(url):
+        fetched_urls.append(url)
+        return default_url_fetcher(url)
+
+    renderer = Renderer(stylesheets=[CSS(string='@page { size: 8px }')])
+    htmls = [
+        FakeHTML(string=f'<img src="{path.as_uri()}">{i}', url_fetcher=fetcher)
+        for i in range(3)]
+    documents = list(renderer.render_many(htmls))
+    assert len(documents) == 3
+    for document in documents:
+        assert document.pages[0].width == 8
+        assert document.font_config is not renderer.font_config
+    assert fetched_urls == [path.as_uri()]
+    pdfs = renderer.write_pdf_many(htmls)
+    assert len(pdfs) == 3
+    assert all(pdf.startswith(b'%PDF') for pdf in pdfs)
+
+
+@assert_no_logs
+def test_renderer_font_faces():
+    base_url = resource_path('<inline HTML>')
+    stylesheet = CSS(string='''
+      @font-face { src: url(weasyprint.otf); font-family: weasyprint-user }
+    ''', base_url=base_url)
+    renderer = Renderer(stylesheets=[stylesheet])
+    html = '''
+      <style>
+        @font-face { src: url(weasyprint.otf); font-family: weasyprint-document }
+      </style>
+      <p style="font-family: weasyprint-document">a</p>
+    '''
+    document = renderer.render(FakeHTML(string=html, base_url=base_url))
+    assert len(document.font_config._fonts) == 2
+    # Fonts of documents are not kept by the renderer.
+    assert len(renderer.font_config._fonts) == 1
+    document = renderer.render(FakeHTML(string='<p>a</p>'))
+    assert len(document.font_config._fonts) == 1
+
+
+@assert_no_logs
+def test_renderer_cache_size():
+    fetched_urls = []
+
+    def fetcher(url):
+        fetched_urls.append(url)
+        return default_url_fetcher(url)
+
+    renderer = Renderer(cache_size=1)
+    urls = [
+        resource_path(name).as_uri()
+        for name in ('pattern.png', 'blue.jpg', 'pattern.png')]
+    for url in urls:
+        renderer.render(FakeHTML(string=f'<img src="{url}">', url_fetcher=fetcher))
+    assert fetched_urls == urls
+    cache = renderer.options['cache']
+    assert [
+        key for key, value in cache.items()
+        if not isinstance(value, bytes)] == [urls[-1]]
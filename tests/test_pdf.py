@@ -8,7 +8,8 @@ from codecs import BOM_UTF16_BE
 import pytest
 
 from weasyprint import Attachment
-from weasyprint.document import Document, DocumentMetadata
+from weasyprint.document import Document, DocumentMetadata, PersistentCache
+from weasyprint.pdf.fonts import _cleaned_fonts
 from weasyprint.text.fonts import FontConfiguration
 from weasyprint.urls import path2url
 
@@ -751,3 +752,100 @@ def test_font_descent_ascent():
     ''').write_pdf()
     assert b'/Descent -200' in pdf
     assert b'/Ascent 800' in pdf
+
+
+@assert_no_logs
+@pytest.mark.parametrize('uncompressed_pdf', (True, False))
+def test_workers(uncompressed_pdf):
+    document = FakeHTML(string='''
+      <style>@page { size: 100px }</style>
+      <p style="break-after: page">abc</p><img src="pattern.png">
+    ''', base_url=resource_path('<inline HTML>')).render()
+    options = {'uncompressed_pdf': uncompressed_pdf, 'pdf_identifier': True}
+    assert document.write_pdf(workers=4, **options) == document.write_pdf(**options)
+
+
+@assert_no_logs
+@pytest.mark.parametrize('identifier', (None, True, b'abc'))
+def test_streaming_pdf(identifier):
+    document = FakeHTML(string='''
+      <style>@page { size: 100px }</style>
+      <p style="break-after: page">abc</p><img src="pattern.png">
+      <div style="opacity: 0.5">def</div>
+    ''', base_url=resource_path('<inline HTML>')).render()
+    pdf = document.write_pdf(
+        streaming_pdf=True, uncompressed_pdf=True, pdf_identifier=identifier)
+    assert pdf.startswith(b'%PDF-1.7\n')
+    assert pdf.endswith(b'%%EOF\n')
+    xref_position = int(pdf.split(b'startxref\n')[1].split()[0])
+    xref = pdf[xref_position:].split(b'trailer')[0].splitlines()[3:]
+    for number, line in enumerate(xref, start=1):
+        offset = int(line.split()[0])
+        assert pdf[offset:].startswith(f'{number} 0 obj'.encode())
+    assert (b'/ID' in pdf) == bool(identifier)
+    if identifier == b'abc':
+        assert b'/ID [(abc)' in pdf
+
+    compressed_pdf = document.write_pdf(streaming_pdf=True)
+    assert b'/Type /ObjStm' in compressed_pdf
+    assert b'/Subtype /Image' in compressed_pdf
+
+
+@assert_no_logs
+@pytest.mark.parametrize('options', (
+    {},
+    {'optimize_images': True},
+    {'dpi': 10},
+))
+def test_persistent_cache(tmp_path, monkeypatch, options):
+    html = '''
+      <img src="pattern.png"><img src="pattern.gif">
+      <img src="blue.jpg"><img src="logo_small.png">
+    '''
+    base_url = resource_path('<inline HTML>')
+    reference = FakeHTML(string=html, base_url=base_url).write_pdf(**options)
+    opened_caches = []
+    init = PersistentCache.__init__
+
+    def recording_init(cache, *args, **kwargs):
+        opened_caches.append(cache)
+        init(cache, *args, **kwargs)
+
+    monkeypatch.setattr(PersistentCache, '__init__', recording_init)
+    for _ in range(2):
+        pdf = FakeHTML(string=html, base_url=base_url).write_pdf(
+            persistent_cache=tmp_path, **options)
+        assert pdf == reference
+    assert list(tmp_path.glob('*/*'))
+    # The cache is opened once for each rendering.
+    assert len(opened_caches) == 2
+
+
+@assert_no_logs
+def test_persistent_cache_size(tmp_path):
+    # Size limit is enforced when the cache is first opened.
+    for _ in range(2):
+        for i in range(10):
+            (tmp_path / f'{i:02}').mkdir(exist_ok=True)
+            (tmp_path / f'{i:02}' / 'file').write_bytes(b'a' * 1000)
+        PersistentCache(tmp_path, max_size=3000)
+    assert sum(path.stat().st_size for path in tmp_path.glob('*/*')) == 10000
+    FakeHTML(string='<img src="pattern.png">', base_url=resource_path(
+        '<inline HTML>')).write_pdf(
+            persistent_cache=tmp_path, persistent_cache_size=0)
+    assert not list(tmp_path.glob('*/*'))
+
+
+@assert_no_logs
+def test_cleaned_fonts_cache(tmp_path):
+    html = '<html style="font-family: weasyprint">abc <span>def</span>'
+    pdf = FakeHTML(string=html).write_pdf()
+    assert FakeHTML(string=html).write_pdf() == pdf
+    assert any(key.startswith('font-') for key in _cleaned_fonts)
+    _cleaned_fonts.clear()
+    assert FakeHTML(string=html).write_pdf(persistent_cache=tmp_path) == pdf
+    files = sorted(tmp_path.glob('*/*'))
+    assert files
+    _cleaned_fonts.clear()
+    assert FakeHTML(string=html).write_pdf(persistent_cache=tmp_path) == pdf
+    assert sorted(tmp_path.glob('*/*')) == files
@@ -4,7 +4,7 @@ import pytest
 
 from weasyprint.css.properties import INITIAL_VALUES
 from weasyprint.formatting_structure.build import capitalize
-from weasyprint.text.line_break import split_first_line
+from weasyprint.text.line_break import get_hyphenated_starts, split_first_line
 
 from .testing_utils import MONO_FONTS, SANS_FONTS, assert_no_logs, render_pages
 
@@ -1371,3 +1371,40 @@ def test_first_letter_text_transform():
     first_letter, _ = line.children
     first_letter_text, = first_letter.children
     assert first_letter_text.text == 'A'
+
+
+@assert_no_logs
+def test_text_reused_layouts():
+    # Pango layouts reused by texts don't keep the attributes of previous texts.
+    page, = render_pages('''
+      <style>p { font-family: weasyprint; font-size: 2px; line-height: 1 }</style>
+      <p style="letter-spacing: 2px; text-decoration: underline">abc</p>
+      <p style="word-spacing: 4px">d e</p>
+      <p>def</p>
+      <p style="text-decoration: underline">ghi</p>
+    ''')
+    html, = page.children
+    body, = html.children
+    widths = [
+        paragraph.children[0].children[0].width for paragraph in body.children]
+    assert widths[1] == 10
+    assert widths[2] == widths[3] == 6
+
+
+@assert_no_logs
+def test_hyphenate_shared_cache():
+    # Hyphenated words are shared by documents.
+    get_hyphenated_starts.cache_clear()
+    lines_texts = []
+    for _ in range(2):
+        page, = render_pages(
+            '<html style="width: 8em; font-family: weasyprint">'
+            '<body style="hyphens: auto" lang=fr>anticonstitutionnellement')
+        html, = page.children
+        body, = html.children
+        lines_texts.append([line.children[0].text for line in body.children])
+    assert lines_texts[0] == lines_texts[1]
+    assert len(lines_texts[0]) > 1
+    assert lines_texts[0][0].endswith('‐')
+    cache_info = get_hyphenated_starts.cache_info()
+    assert cache_info.hits >= cache_info.misses > 0
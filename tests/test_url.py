@@ -1,9 +1,15 @@
 """Test URLs."""
 
+import contextlib
+import http.server
 import re
+import threading
+from urllib.error import HTTPError
 
 import pytest
 
+from weasyprint import PooledURLFetcher
+
 from .testing_utils import FakeHTML, capture_logs, resource_path
 
 
@@ -30,3 +36,84 @@ def test_malformed_url_link(url, base_url):
     assert uris.pop(0) == url.encode()
     assert subtypes.pop(0) == b'/Link'
     assert types.pop(0) == b'/URI'
+
+
+@contextlib.contextmanager
+def http_server(responses):
+    """Run HTTP/1.1 server giving responses, yield root URL and requests."""
+    requests = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            requests.append((self.path, self.client_address, dict(self.headers)))
+            status, headers, body = responses[self.path](self.headers)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}', requests
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_pooled_url_fetcher():
+    def etag(headers):
+        if headers['If-None-Match'] == '"1"':
+            return 304, {'ETag': '"1"'}, b''
+        return 200, {'ETag': '"1"', 'Content-Type': 'text/css'}, b'etag'
+
+    responses = {
+        '/fresh': lambda headers: (
+            200, {'Cache-Control': 'max-age=60', 'Content-Type': 'image/png'},
+            b'fresh'),
+        '/etag': etag,
+        '/no-store': lambda headers: (
+            200, {'Cache-Control': 'no-store', 'ETag': '"2"'}, b'no-store'),
+        '/redirect': lambda headers: (302, {'Location': '/fresh'}, b''),
+        '/missing': lambda headers: (404, {}, b''),
+    }
+    url_fetcher = PooledURLFetcher()
+    with http_server(responses) as (root, requests):
+        for _ in range(2):
+            result = url_fetcher(f'{root}/fresh')
+            assert result['string'] == b'fresh'
+            assert result['mime_type'] == 'image/png'
+            result = url_fetcher(f'{root}/etag')
+            assert result['string'] == b'etag'
+            assert result['mime_type'] == 'text/css'
+            assert url_fetcher(f'{root}/no-store')['string'] == b'no-store'
+            result = url_fetcher(f'{root}/redirect')
+            assert result['string'] == b'fresh'
+            assert result['redirected_url'] == f'{root}/fresh'
+            with pytest.raises(HTTPError):
+                url_fetcher(f'{root}/missing')
+        url_fetcher.close()
+
+    # Fresh responses are cached, others are revalidated or fetched again.
+    paths = [path for path, _, _ in requests]
+    assert paths == [
+        '/fresh', '/etag', '/no-store', '/redirect', '/missing',
+        '/etag', '/no-store', '/redirect', '/missing']
+    assert requests[5][2]['If-None-Match'] == '"1"'
+
+    # The same connection is used for all the requests.
+    assert len({address for _, address, _ in requests}) == 1
+
+    # Other URLs are given to the default URL fetcher.
+    result = url_fetcher(resource_path('pattern.png').as_uri())
+    assert result['file_obj'].read() == resource_path('pattern.png').read_bytes()
+    result['file_obj'].close()
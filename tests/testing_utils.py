@@ -53,6 +53,9 @@ class FakeHTML(HTML):
     def render(self, font_config=None, *args, **kwargs):
         return super().render(TEST_UA_FONT_CONFIG, *args, **kwargs)
 
+    def render_iter(self, font_config=None, *args, **kwargs):
+        return super().render_iter(TEST_UA_FONT_CONFIG, *args, **kwargs)
+
     def write_pdf(self, target=None, zoom=1, finisher=None, **options):
         # Override function to force the generation of uncompressed PDFs
         if self._force_uncompressed_pdf:
@@ -7,6 +7,7 @@ importing sub-modules.
 
 import contextlib
 from datetime import datetime
+from hashlib import sha256
 from os.path import getctime, getmtime
 from pathlib import Path
 from urllib.parse import urljoin
@@ -63,6 +64,33 @@ VERSION = __version__ = '65.0'
 #: :param cache:
 #:     A dictionary used to cache images in memory, or a folder path where
 #:     images are temporarily stored.
+#: :type persistent_cache: :class:`pathlib.Path` or :obj:`str`
+#: :param persistent_cache:
+#:     A folder path where converted images and subset fonts are stored, and
+#:     kept between renderings and processes.
+#: :param int persistent_cache_size:
+#:     Maximum size in bytes of the ``persistent_cache`` folder, 512 MiB by
+#:     default.
+#: :param int workers:
+#:     Number of threads used to serialize and compress PDF streams.
+#: :param bool streaming_pdf:
+#:     Whether PDF streams should be written as soon as they are generated,
+#:     instead of keeping the whole PDF in memory until the end. Page and
+#:     image streams can't be modified by finishers when this option is set.
+#: :param dict stylesheet_cache:
+#:     A dictionary used to cache preprocessed stylesheets, that can be shared
+#:     between documents.
+#: :param int prefetch:
+#:     Number of threads used to fetch images concurrently before layout.
+#: :param int cascade_processes:
+#:     Number of processes used to match selectors against the elements of
+#:     large documents. Only available on systems where processes can be
+#:     forked, and ignored when other threads are running.
+#: :type metrics: :term:`callable`
+#: :param metrics:
+#:     A function called with a dictionary when each rendering stage starts
+#:     and ends, including durations and counters. (See :ref:`Rendering
+#:     Metrics`.)
 DEFAULT_OPTIONS = {
     'stylesheets': None,
     'media_type': 'print',
@@ -81,16 +109,25 @@ DEFAULT_OPTIONS = {
     'full_fonts': False,
     'hinting': False,
     'cache': None,
+    'persistent_cache': None,
+    'persistent_cache_size': None,
+    'workers': None,
+    'streaming_pdf': False,
+    'stylesheet_cache': None,
+    'prefetch': None,
+    'cascade_processes': None,
+    'metrics': None,
 }
 
 __all__ = [
     'CSS', 'DEFAULT_OPTIONS', 'HTML', 'VERSION', 'Attachment', 'Document', 'Page',
-    '__version__', 'default_url_fetcher']
+    'PooledURLFetcher', 'Renderer', '__version__', 'default_url_fetcher']
 
 
 # Import after setting the version, as the version is used in other modules
 from .urls import (  # noqa: I001, E402
-    fetch, default_url_fetcher, path2url, ensure_url, url_is_absolute)
+    fetch, default_url_fetcher, path2url, ensure_url, url_is_absolute,
+    PooledURLFetcher)
 from .logger import LOGGER, PROGRESS_LOGGER  # noqa: E402
 # Some imports are at the end of the file (after the CSS class)
 # to work around circular imports.
@@ -186,14 +223,16 @@ class HTML:
 
     def _ua_stylesheets(self, forms=False):
         if forms:
-            return [HTML5_UA_STYLESHEET, HTML5_UA_FORM_STYLESHEET]
-        return [HTML5_UA_STYLESHEET]
+            return [
+                html_module.HTML5_UA_STYLESHEET,
+                html_module.HTML5_UA_FORM_STYLESHEET]
+        return [html_module.HTML5_UA_STYLESHEET]
 
     def _ua_counter_style(self):
-        return [HTML5_UA_COUNTER_STYLE.copy()]
+        return [html_module.HTML5_UA_COUNTER_STYLE.copy()]
 
     def _ph_stylesheets(self):
-        return [HTML5_PH_STYLESHEET]
+        return [html_module.HTML5_PH_STYLESHEET]
 
     def render(self, font_config=None, counter_style=None, **options):
         """Lay out and paginate the document, but do not (yet) export it.
@@ -221,6 +260,36 @@ class HTML:
         options = new_options
         return Document._render(self, font_config, counter_style, options)
 
+    def render_iter(self, font_config=None, counter_style=None, **options):
+        """Lay out and paginate the document, yielding pages when ready.
+
+        Pages are yielded as soon as they are laid out, unless they depend on
+        following pages (because of page-based counters, ``target-*``
+        functions, or fixed boxes). In this case, all pages are laid out
+        before the first one is yielded.
+
+        :type font_config: :class:`text.fonts.FontConfiguration`
+        :param font_config:
+            A font configuration handling ``@font-face`` rules. A new one is
+            created if not provided. It is stored as the ``font_config``
+            attribute of the pages, and must be given to
+            :class:`document.Document` if the pages are then exported.
+        :type counter_style: :class:`css.counters.CounterStyle`
+        :param counter_style:
+            A dictionary storing ``@counter-style`` rules.
+        :param options:
+            The ``options`` parameter includes by default the
+            :data:`DEFAULT_OPTIONS` values.
+        :returns: A generator of :class:`document.Page` objects.
+
+        """
+        for unknown in set(options) - set(DEFAULT_OPTIONS):
+            LOGGER.warning('Unknown rendering option: %s.', unknown)
+        new_options = DEFAULT_OPTIONS.copy()
+        new_options.update(options)
+        options = new_options
+        return Document._render_pages(self, font_config, counter_style, options)
+
     def write_pdf(self, target=None, zoom=1, finisher=None,
                   font_config=None, counter_style=None, **options):
         """Render the document to a PDF file.
@@ -261,11 +330,16 @@ class HTML:
         new_options = DEFAULT_OPTIONS.copy()
         new_options.update(options)
         options = new_options
+        open_persistent_cache(options)
         return (
             self.render(font_config, counter_style, **options)
             .write_pdf(target, zoom, finisher, **options))
 
 
+# Maximum number of stylesheets stored in stylesheet caches.
+STYLESHEET_CACHE_SIZE = 100
+
+
 class CSS:
     """CSS stylesheet parsed by tinycss2.
 
@@ -280,12 +354,17 @@ class CSS:
     to be used in the :meth:`HTML.write_pdf` and :meth:`HTML.render` methods
     of :class:`HTML` objects.
 
+    An optional ``cache`` dictionary can be given to store preprocessed
+    stylesheets, indexed by the hash of their content, their base URL and
+    their media type. Stylesheets found in the cache are not parsed again,
+    their ``@font-face`` rules are added to the given ``font_config``.
+
     """
     def __init__(self, guess=None, filename=None, url=None, file_obj=None,
                  string=None, encoding=None, base_url=None,
                  url_fetcher=default_url_fetcher, _check_mime_type=False,
                  media_type='print', font_config=None, counter_style=None,
-                 matcher=None, page_rules=None):
+                 matcher=None, page_rules=None, cache=None):
         PROGRESS_LOGGER.info(
             'Step 2 - Fetching and parsing CSS - %s',
             filename or url or getattr(file_obj, 'name', 'CSS string'))
@@ -296,6 +375,18 @@ class CSS:
         with result as (source_type, source, base_url, protocol_encoding):
             if source_type == 'file_obj':
                 source = source.read()
+            # Stylesheets imported by other ones share their matcher and
+            # can't be cached.
+            if cache is not None and matcher is None:
+                key = _stylesheet_cache_key(
+                    source, base_url, media_type, encoding, protocol_encoding)
+                if (cached := cache.pop(key, None)) is not None:
+                    # Keep recently used stylesheets at the end of the cache.
+                    cache[key] = cached
+                    self._replay(
+                        cached, base_url, page_rules, font_config,
+                        counter_style, url_fetcher)
+                    return
             if isinstance(source, str):
                 # unicode, no encoding
                 stylesheet = tinycss2.parse_stylesheet(source)
@@ -304,12 +395,95 @@ class CSS:
                     source, environment_encoding=encoding,
                     protocol_encoding=protocol_encoding)
         self.base_url = base_url
-        self.matcher = matcher or cssselect2.Matcher()
+        self.matcher = matcher or Matcher()
         self.page_rules = [] if page_rules is None else page_rules
         counter_style = {} if counter_style is None else counter_style
+        if cache is None or matcher is not None or any(
+                rule.type == 'at-rule' and rule.lower_at_keyword == 'import'
+                for rule in stylesheet):
+            # Imported stylesheets may change, don't cache their importer.
+            preprocess_stylesheet(
+                media_type, base_url, stylesheet, url_fetcher, self.matcher,
+                self.page_rules, font_config, counter_style)
+            return
+
+        # Record rules added to shared objects, to replay them later.
+        page_rules, font_faces = [], _FontFaceRecorder(font_config)
+        previous_counter_styles = counter_style.copy()
         preprocess_stylesheet(
             media_type, base_url, stylesheet, url_fetcher, self.matcher,
-            self.page_rules, font_config, counter_style)
+            page_rules, font_faces, counter_style)
+        self.page_rules.extend(page_rules)
+        counter_styles = {
+            name: value.copy() for name, value in counter_style.items()
+            if previous_counter_styles.get(name) is not value}
+        cache[key] = (self.matcher, page_rules, font_faces.rules, counter_styles)
+        while len(cache) > STYLESHEET_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+
+    @classmethod
+    def from_bundle(cls, bundle, url_fetcher=default_url_fetcher,
+                    font_config=None, counter_style=None):
+        """Create stylesheet from a bundle of preprocessed stylesheets.
+
+        Bundles are created by the ``weasyprint-compile-css`` program. They
+        are not parsed and validated again, but must only be loaded from
+        trusted sources, with the version of WeasyPrint used to create them.
+
+        :type bundle: :class:`str`, :class:`pathlib.Path` or :term:`file object`
+        :param bundle: The filename or binary file object of the bundle.
+        :param url_fetcher:
+            A function or other callable used to fetch ``@font-face`` fonts.
+        :type font_config: :class:`text.fonts.FontConfiguration`
+        :param font_config:
+            A font configuration handling ``@font-face`` rules.
+        :type counter_style: :class:`css.counters.CounterStyle`
+        :param counter_style:
+            A dictionary storing ``@counter-style`` rules.
+
+        """
+        base_url, *cached = read_bundle(bundle)
+        css = cls.__new__(cls)
+        css._replay(
+            cached, base_url, None, font_config, counter_style, url_fetcher)
+        return css
+
+    def _replay(self, cached, base_url, page_rules, font_config, counter_style,
+                url_fetcher):
+        """Use cached preprocessed stylesheet."""
+        matcher, cached_page_rules, font_faces, counter_styles = cached
+        self.base_url = base_url
+        self.matcher = matcher
+        self.page_rules = [] if page_rules is None else page_rules
+        self.page_rules.extend(cached_page_rules)
+        if font_config is not None:
+            for rule_descriptors in font_faces:
+                font_config.add_font_face(rule_descriptors, url_fetcher)
+        if counter_style is not None:
+            for name, counter in counter_styles.items():
+                counter_style[name] = counter.copy()
+
+
+class _FontFaceRecorder:
+    """Font configuration proxy recording ``@font-face`` rules."""
+    def __init__(self, font_config):
+        self._font_config = font_config
+        self.rules = []
+
+    def add_font_face(self, rule_descriptors, url_fetcher):
+        self.rules.append(rule_descriptors)
+        if self._font_config is not None:
+            self._font_config.add_font_face(rule_descriptors, url_fetcher)
+
+
+def _stylesheet_cache_key(source, base_url, media_type, encoding,
+                          protocol_encoding):
+    """Get key identifying the content and context of a stylesheet."""
+    if isinstance(source, str):
+        source = source.encode()
+        encoding = protocol_encoding = None
+    digest = sha256(source).hexdigest()
+    return (digest, base_url, media_type, encoding, protocol_encoding)
 
 
 class Attachment:
@@ -363,6 +537,131 @@ class Attachment:
         self.modified = modified
 
 
+class Renderer:
+    """Renderer sharing resources between multiple HTML documents.
+
+    Rendering a document requires resources that are independent of the
+    document itself: fonts, user stylesheets, ``@counter-style`` rules and
+    images. A renderer creates these resources once and reuses them for all
+    the documents it renders, only the per-document work (parsing, cascade,
+    layout and painting) is repeated.
+
+    :type font_config: :class:`text.fonts.FontConfiguration`
+    :param font_config:
+        A font configuration handling ``@font-face`` rules of user
+        stylesheets, copied for each document. A new one is created if not
+        provided.
+    :type counter_style: :class:`css.counters.CounterStyle`
+    :param counter_style:
+        A dictionary storing ``@counter-style`` rules, copied for each
+        document.
+    :param int cache_size:
+        Maximum number of images kept in the shared image cache between two
+        documents. Ignored if a ``cache`` option is given.
+    :param options:
+        The ``options`` parameter includes by default the
+        :data:`DEFAULT_OPTIONS` values. User stylesheets given in the
+        ``stylesheets`` option are parsed once, when the renderer is created.
+        Stylesheets included in documents are stored in a shared
+        ``stylesheet_cache`` if no cache is given.
+
+    ``@font-face`` rules included in documents are only added to the copy of
+    the font configuration used by each document. Images and stylesheets are
+    shared, a renderer must thus be used only by one thread at a time.
+
+    """
+    def __init__(self, font_config=None, counter_style=None, cache_size=1000,
+                 **options):
+        for unknown in set(options) - set(DEFAULT_OPTIONS):
+            LOGGER.warning('Unknown rendering option: %s.', unknown)
+        self.options = DEFAULT_OPTIONS.copy()
+        self.options.update(options)
+        self.font_config = (
+            FontConfiguration() if font_config is None else font_config)
+        self.counter_style = (
+            CounterStyle() if counter_style is None else counter_style)
+        self.options['stylesheets'] = [
+            css if hasattr(css, 'matcher') else CSS(
+                guess=css, media_type=self.options['media_type'],
+                font_config=self.font_config,
+                counter_style=self.counter_style)
+            for css in self.options['stylesheets'] or []]
+        if self.options['cache'] is None:
+            self.options['cache'] = {}
+            self._cache_size = cache_size
+        else:
+            self._cache_size = None
+        if self.options['stylesheet_cache'] is None:
+            self.options['stylesheet_cache'] = {}
+        open_persistent_cache(self.options)
+
+    def _trim_cache(self):
+        """Remove the oldest images from the cache, keeping at most
+        ``cache_size`` images."""
+        cache = self.options['cache']
+        # Values that are not bytes are images (or None for broken images)
+        # indexed by their URL. Their data is stored with keys starting with
+        # the image id.
+        urls = [key for key, value in cache.items() if not isinstance(value, bytes)]
+        for url in urls[:max(0, len(urls) - self._cache_size)]:
+            image = cache.pop(url)
+            if image_id := getattr(image, 'id', None):
+                for key in [key for key in cache if key.startswith(f'{image_id}-')]:
+                    del cache[key]
+
+    def render(self, html):
+        """Lay out and paginate a document, using the shared resources.
+
+        :param html: An :class:`HTML` object.
+        :returns: A :class:`document.Document` object.
+
+        """
+        document = html.render(
+            self.font_config.copy(), self.counter_style.copy(), **self.options)
+        if self._cache_size is not None:
+            self._trim_cache()
+        return document
+
+    def render_many(self, htmls):
+        """Lay out and paginate documents, one after the other.
+
+        :type htmls: :term:`iterable`
+        :param htmls: An iterable of :class:`HTML` objects.
+        :returns:
+            A generator of :class:`document.Document` objects, rendered only
+            when requested.
+
+        """
+        for html in htmls:
+            yield self.render(html)
+
+    def write_pdf_many(self, htmls, targets=None, zoom=1, finisher=None):
+        """Render documents to PDF files, one after the other.
+
+        :type htmls: :term:`iterable`
+        :param htmls: An iterable of :class:`HTML` objects.
+        :type targets: :term:`iterable`
+        :param targets:
+            An iterable of filenames or file objects, one for each document,
+            or :obj:`None`.
+        :param float zoom:
+            The zoom factor in PDF units per CSS units.
+        :type finisher: :term:`callable`
+        :param finisher:
+            A finisher function or callable, called for each document.
+        :returns:
+            A list of PDF documents as :obj:`bytes` if ``targets`` is not
+            provided, otherwise :obj:`None`.
+
+        """
+        if targets is None:
+            return [
+                document.write_pdf(None, zoom, finisher, **self.options)
+                for document in self.render_many(htmls)]
+        for document, target in zip(self.render_many(htmls), targets):
+            document.write_pdf(target, zoom, finisher, **self.options)
+
+
 @contextlib.contextmanager
 def _select_source(guess=None, filename=None, url=None, file_obj=None,
                    string=None, base_url=None, url_fetcher=default_url_fetcher,
@@ -428,7 +727,9 @@ def _select_source(guess=None, filename=None, url=None, file_obj=None,
 
 # Work around circular imports.
 from .css import preprocess_stylesheet  # noqa: I001, E402
-from .html import (  # noqa: E402
-    HTML5_UA_COUNTER_STYLE, HTML5_UA_STYLESHEET, HTML5_UA_FORM_STYLESHEET,
-    HTML5_PH_STYLESHEET)
-from .document import Document, Page  # noqa: E402
+from . import html as html_module  # noqa: E402
+from .css.bundle import read_bundle  # noqa: E402
+from .css.counters import CounterStyle  # noqa: E402
+from .css.matcher import Matcher  # noqa: E402
+from .document import Document, Page, open_persistent_cache  # noqa: E402
+from .text.fonts import FontConfiguration  # noqa: E402
@@ -1,17 +1,29 @@
 """Command-line interface to WeasyPrint."""
 
 import argparse
+import base64
+import io
+import json
 import logging
+import multiprocessing
 import platform
+import socketserver
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import redirect_stderr, redirect_stdout
 from functools import partial
+from hashlib import sha256
+from pathlib import Path
+from time import perf_counter
 
 import pydyf
 
-from . import DEFAULT_OPTIONS, HTML, LOGGER, __version__
+from . import DEFAULT_OPTIONS, HTML, LOGGER, Renderer, __version__
+from .logger import capture_logs
 from .pdf import VARIANTS
 from .text.ffi import pango
-from .urls import default_url_fetcher
+from .urls import PooledURLFetcher, default_url_fetcher
 
 
 class PrintInfo(argparse.Action):
@@ -65,9 +77,11 @@ class Parser(argparse.ArgumentParser):
 
 PARSER = Parser(prog='weasyprint', description='Render web pages to PDF.')
 PARSER.add_argument(
-    'input', help='URL or filename of the HTML input, or - for stdin')
+    'input', nargs='?',
+    help='URL or filename of the HTML input, or - for stdin')
 PARSER.add_argument(
-    'output', help='filename where output is written, or - for stdout')
+    'output', nargs='?',
+    help='filename where output is written, or - for stdout')
 PARSER.add_argument(
     '-e', '--encoding', help='force the input character encoding')
 PARSER.add_argument(
@@ -117,9 +131,28 @@ PARSER.add_argument(
     '-c', '--cache-folder', dest='cache',
     help='store cache on disk instead of memory, folder is '
     'created if needed and cleaned after the PDF is generated')
+PARSER.add_argument(
+    '--persistent-cache-folder', dest='persistent_cache',
+    help='store converted images and fonts in a folder kept between '
+    'renderings, folder is created if needed')
+PARSER.add_argument(
+    '--persistent-cache-size', type=int,
+    help='set maximum size in bytes of the persistent cache folder')
 PARSER.add_argument(
     '-D', '--dpi', type=int,
     help='set maximum resolution of images embedded in the PDF')
+PARSER.add_argument(
+    '--streaming-pdf', action='store_true',
+    help='write PDF streams as soon as they are generated, to save memory')
+PARSER.add_argument(
+    '--workers', type=int,
+    help='set number of threads used to compress the PDF')
+PARSER.add_argument(
+    '--prefetch', type=int,
+    help='set number of threads used to fetch images before layout')
+PARSER.add_argument(
+    '--cascade-processes', type=int,
+    help='set number of processes used to match selectors against elements')
 PARSER.add_argument(
     '-v', '--verbose', action='store_true',
     help='show warnings and information messages')
@@ -137,8 +170,210 @@ PARSER.add_argument(
 PARSER.add_argument(
     '-t', '--timeout', type=int,
     help='Set timeout in seconds for HTTP requests')
+PARSER.add_argument(
+    '--keep-alive', action='store_true',
+    help='keep HTTP connections open and cache HTTP responses, '
+    'shared between jobs in server mode')
+PARSER.add_argument(
+    '--serve', nargs='?', const='-',
+    help='render jobs received as JSON lines on the given Unix socket path, '
+    'or on stdin if no path is given, instead of rendering input')
+PARSER.add_argument(
+    '--processes', type=int, default=1,
+    help='set number of processes rendering jobs in server mode')
 PARSER.set_defaults(**DEFAULT_OPTIONS)
 
+# Renderers kept by the current process in server mode, indexed by options.
+_RENDERERS = {}
+_MAX_RENDERERS = 16
+
+# Pooled URL fetchers kept by the current process, indexed by timeout.
+_URL_FETCHERS = {}
+
+
+def _get_options(args):
+    """Get URL fetcher and rendering options from parsed arguments."""
+    url_fetcher = default_url_fetcher
+    if args.keep_alive:
+        timeout = 10 if args.timeout is None else args.timeout
+        if timeout not in _URL_FETCHERS:
+            _URL_FETCHERS[timeout] = PooledURLFetcher(timeout)
+        url_fetcher = _URL_FETCHERS[timeout]
+    elif args.timeout is not None:
+        url_fetcher = partial(default_url_fetcher, timeout=args.timeout)
+    options = {
+        key: value for key, value in vars(args).items() if key in DEFAULT_OPTIONS}
+    return url_fetcher, options
+
+
+def _get_renderer_key(options):
+    """Get key of the renderer cached for options, or None if not cacheable.
+
+    User stylesheets are parsed by renderers, the key includes the hash of
+    their content. Stylesheets that are not local files may change between
+    jobs, renderers using them are not cached.
+
+    """
+    stylesheets = []
+    for stylesheet in options['stylesheets'] or []:
+        try:
+            digest = sha256(Path(stylesheet).read_bytes()).hexdigest()
+        except (OSError, ValueError):
+            return None
+        stylesheets.append((stylesheet, digest))
+    return json.dumps(
+        {**options, 'stylesheets': stylesheets}, sort_keys=True, default=str)
+
+
+def render_job(job, HTML=HTML):  # noqa: N803
+    """Render a job received in server mode, return the response.
+
+    ``job`` is a dictionary including the command-line arguments in ``args``,
+    an optional ``id`` copied in the response, and the HTML string in
+    ``input`` when the input argument is ``-``.
+
+    The response is a dictionary including the ``id``, the ``duration`` of
+    the rendering, the logged warnings and errors in ``logs``, the PDF encoded
+    in base64 in ``output`` when the output argument is ``-``, and an
+    ``error`` message when the rendering failed.
+
+    """
+    response = {'id': job.get('id')}
+    start = perf_counter()
+    try:
+        with capture_logs(level=logging.WARNING) as logs:
+            try:
+                # Help, version, information and errors are printed by the
+                # parser, don't mix them with responses.
+                with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+                    args = PARSER.parse_args(job['args'])
+            except SystemExit:
+                raise ValueError('invalid arguments') from None
+            if args.serve or None in (args.input, args.output):
+                raise ValueError('input and output arguments required')
+
+            # Renderers share system fonts and stylesheets between jobs.
+            url_fetcher, options = _get_options(args)
+            if (key := _get_renderer_key(options)) is None:
+                renderer = Renderer(**options)
+            else:
+                if (renderer := _RENDERERS.pop(key, None)) is None:
+                    renderer = Renderer(**options)
+                _RENDERERS[key] = renderer
+                while len(_RENDERERS) > _MAX_RENDERERS:
+                    _RENDERERS.pop(next(iter(_RENDERERS)))
+                # Images may change between jobs, fetch them again.
+                renderer.options['cache'].clear()
+
+            base_url = args.base_url
+            if args.input == '-':
+                source = io.BytesIO(job.get('input', '').encode())
+                base_url = '.' if base_url is None else (base_url or None)
+            else:
+                source = args.input
+            output = io.BytesIO() if args.output == '-' else args.output
+            html = HTML(
+                source, base_url=base_url, encoding=args.encoding,
+                media_type=args.media_type, url_fetcher=url_fetcher)
+            renderer.render(html).write_pdf(output, **renderer.options)
+            if args.output == '-':
+                response['output'] = base64.b64encode(output.getvalue()).decode()
+    except Exception as exception:
+        response['error'] = str(exception) or type(exception).__name__
+    response['duration'] = perf_counter() - start
+    response['logs'] = logs
+    return response
+
+
+def _serve_lines(executor, lines, write, HTML=HTML):  # noqa: N803
+    """Render jobs read from lines, write responses when jobs are done."""
+    def done(future, job_id):
+        try:
+            response = future.result()
+        except Exception as exception:
+            response = {'id': job_id, 'error': str(exception), 'logs': []}
+        write(response)
+
+    futures = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+            if isinstance(job, list):
+                job = {'args': job}
+            job_id = job.get('id')
+        except (ValueError, AttributeError):
+            write({'id': None, 'error': 'invalid job', 'logs': []})
+            continue
+        future = executor.submit(render_job, job, HTML)
+        future.add_done_callback(partial(done, job_id=job_id))
+        futures.append(future)
+    wait(futures)
+
+
+class _StreamHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        lock = threading.Lock()
+
+        def write(response):
+            with lock:
+                self.wfile.write(json.dumps(response).encode() + b'\n')
+                self.wfile.flush()
+
+        _serve_lines(self.server.executor, self.rfile, write, self.server.HTML)
+
+
+def serve(address='-', processes=1, stdin=None, stdout=None,
+          HTML=HTML):  # noqa: N803
+    """Render jobs received as JSON lines, until input is closed.
+
+    Jobs are received on the Unix socket at ``address``, or on ``stdin`` if
+    ``address`` is ``-``. Each job is rendered by :func:`render_job`, its
+    response is written as a JSON line as soon as the job is done.
+
+    Jobs are rendered in ``processes`` worker processes, forked when
+    possible from the current process to keep loaded libraries.
+
+    """
+    if processes > 1:
+        context = None
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        executor = ProcessPoolExecutor(processes, mp_context=context)
+        # Start workers now, before threads are created to read and serve
+        # jobs, as forking multi-threaded processes may lead to deadlocks.
+        wait([executor.submit(int) for _ in range(processes)])
+    else:
+        executor = ThreadPoolExecutor(1)
+
+    with executor:
+        if address == '-':
+            stdin = stdin or sys.stdin.buffer
+            stdout = stdout or sys.stdout.buffer
+            lock = threading.Lock()
+
+            def write(response):
+                with lock:
+                    stdout.write(json.dumps(response).encode() + b'\n')
+                    stdout.flush()
+
+            _serve_lines(executor, stdin, write, HTML)
+        else:
+            path = Path(address)
+            if path.is_socket():
+                path.unlink()
+            server = socketserver.ThreadingUnixStreamServer(
+                address, _StreamHandler)
+            server.executor, server.HTML = executor, HTML
+            try:
+                with server:
+                    server.serve_forever()
+            except KeyboardInterrupt:  # pragma: no cover
+                pass
+            finally:
+                path.unlink(missing_ok=True)
+
 
 def main(argv=None, stdout=None, stdin=None, HTML=HTML):  # noqa: N803
     """The ``weasyprint`` program takes at least two arguments:
@@ -147,9 +382,18 @@ def main(argv=None, stdout=None, stdin=None, HTML=HTML):  # noqa: N803
 
         weasyprint [options] <input> <output>
 
+    It can also be launched as a server rendering multiple jobs:
+
+    .. code-block:: sh
+
+        weasyprint --serve [<socket>]
+
     """
     args = PARSER.parse_args(argv)
 
+    if args.serve is None and None in (args.input, args.output):
+        PARSER.error('the following arguments are required: input, output')
+
     if args.input == '-':
         source = stdin or sys.stdin.buffer
         if args.base_url is None:
@@ -164,12 +408,7 @@ def main(argv=None, stdout=None, stdin=None, HTML=HTML):  # noqa: N803
     else:
         output = args.output
 
-    url_fetcher = default_url_fetcher
-    if args.timeout is not None:
-        url_fetcher = partial(default_url_fetcher, timeout=args.timeout)
-
-    options = {
-        key: value for key, value in vars(args).items() if key in DEFAULT_OPTIONS}
+    url_fetcher, options = _get_options(args)
 
     # Default to logging to stderr.
     if args.debug:
@@ -188,6 +427,10 @@ def main(argv=None, stdout=None, stdin=None, HTML=HTML):  # noqa: N803
             handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
         LOGGER.addHandler(handler)
 
+    if args.serve is not None:
+        serve(args.serve, args.processes, stdin, stdout, HTML)
+        return
+
     html = HTML(
         source, base_url=args.base_url, encoding=args.encoding,
         media_type=args.media_type, url_fetcher=url_fetcher)
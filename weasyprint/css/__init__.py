@@ -12,9 +12,13 @@ on other functions in this module.
 
 """
 
+import multiprocessing
+import threading
 from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from itertools import groupby
 from logging import DEBUG, WARNING
+from types import MappingProxyType
 
 import cssselect2
 import tinycss2
@@ -26,6 +30,7 @@ from ..logger import LOGGER, PROGRESS_LOGGER
 from ..urls import URLFetchingError, get_url_attribute, url_join
 from . import counters, media_queries
 from .computed_values import COMPUTER_FUNCTIONS
+from .matcher import AncestorFilter, Matcher
 from .properties import INHERITED, INITIAL_NOT_COMPUTED, INITIAL_VALUES, ZERO_PIXELS
 from .validation import preprocess_declarations
 from .validation.descriptors import preprocess_descriptors
@@ -39,13 +44,58 @@ PSEUDO_ELEMENTS = (
     None, 'before', 'after', 'marker', 'first-line', 'first-letter',
     'footnote-call', 'footnote-marker')
 
+# Properties whose computed values depend on the element's attributes.
+ELEMENT_DEPENDENT = {
+    'anchor', 'link', 'lang', 'content', 'string_set', 'bookmark_label'}
+
 PageSelectorType = namedtuple(
     'PageSelectorType', ['side', 'blank', 'first', 'index', 'name'])
 
 
+# Stylesheets and chunks of elements, set before forking processes matching
+# selectors against elements.
+_match_state = None
+
+# Minimum number of elements in body needed to match selectors in processes.
+CASCADE_PROCESSES_MIN_ELEMENTS = 5000
+
+
+def _match_chunk(chunk_index):
+    """Match selectors against the elements of a chunk, in a forked process.
+
+    Return a list including, for each element of the chunk in tree order, a
+    tuple of ``(sheet_index, specificity, order, pseudo_type)`` tuples.
+
+    """
+    sheets, chunks = _match_state
+    chunk = chunks[chunk_index]
+    ancestors = AncestorFilter()
+    for ancestor in chunk[0].ancestors:
+        ancestors.push(ancestor)
+    results = []
+    for child in chunk:
+        stack = [iter([child])]
+        while stack:
+            element = next(stack[-1], None)
+            if element is None:
+                stack.pop()
+                if stack:
+                    ancestors.pop()
+                continue
+            results.append(tuple(
+                (index, specificity, order, pseudo_type)
+                for index, (sheet, _, _) in enumerate(sheets)
+                for specificity, order, pseudo_type, _
+                in sheet.matcher.match(element, ancestors)))
+            ancestors.push(element)
+            stack.append(element.iter_children())
+    return results
+
+
 class StyleFor:
     """Convenience function to get the computed styles for an element."""
-    def __init__(self, html, sheets, presentational_hints, target_collector):
+    def __init__(self, html, sheets, presentational_hints, target_collector,
+                 processes=None):
         # keys: (element, pseudo_element_type)
         #    element: an ElementTree Element or the '@page' string
         #    pseudo_element_type: a string such as 'first' (for @page) or
@@ -64,6 +114,11 @@ class StyleFor:
         #     values: a PropertyValue-like object
         self._computed_styles = {}
 
+        # keys: (id(parent_style), frozenset of (name, id(values)) tuples)
+        # values: computed styles shared between elements whose parent style
+        #     and cascaded declarations are the same
+        shared_styles = {}
+
         self._sheets = sheets
 
         PROGRESS_LOGGER.info('Step 3 - Applying CSS')
@@ -83,27 +138,157 @@ class StyleFor:
         # *in tree order*. Tree order is important so that parents have
         # computed styles before their children, for inheritance.
 
-        # Iterate on all elements, even if there is no cascaded style for them.
-        for element in html.wrapper_element.iter_subtree():
-            for sheet, origin, sheet_specificity in sheets:
-                # Add declarations for matched elements
-                for selector in sheet.matcher.match(element):
-                    specificity, order, pseudo_type, declarations = selector
-                    specificity = sheet_specificity or specificity
-                    style = cascaded_styles.setdefault(
-                        (element.etree_element, pseudo_type), {})
-                    for name, values, importance in declarations:
-                        precedence = declaration_precedence(origin, importance)
-                        weight = (precedence, specificity)
-                        old_weight = style.get(name, (None, None))[1]
-                        if old_weight is None or old_weight <= weight:
-                            style[name] = values, weight
-            parent = element.parent.etree_element if element.parent else None
-            self.set_computed_styles(
-                element.etree_element, root=html.etree_element, parent=parent,
-                base_url=html.base_url, target_collector=target_collector)
-
-        # Then computed styles for pseudo elements, in any order.
+        # Iterate on all elements, even if there is no cascaded style for them,
+        # but don't go into subtrees of elements that are not displayed. Their
+        # styles are only computed if they are requested.
+        self._root = html.etree_element
+        self._base_url = html.base_url
+        self._target_collector = target_collector
+        self._hidden_elements = []
+        # Keep tag names, ids and classes of the ancestors of the current
+        # element, to quickly reject selectors requiring missing ancestors.
+        ancestors = AncestorFilter()
+        matches = self._match_in_processes(html, processes) if processes else {}
+        stack = [iter([html.wrapper_element])]
+        while stack:
+            element = next(stack[-1], None)
+            if element is None:
+                stack.pop()
+                if stack:
+                    ancestors.pop()
+                continue
+            style = self._set_element_styles(
+                element, shared_styles, ancestors,
+                matches.pop(element.etree_element, None))
+            if style['display'] == ('none',):
+                self._hidden_elements.append(element)
+            else:
+                ancestors.push(element)
+                stack.append(element.iter_children())
+        self._set_pseudo_element_styles()
+
+        # Keep the cascaded styles of hidden elements, set by their style
+        # attributes, in case their computed styles are requested later.
+        self._hidden_cascaded_styles = {
+            key: style for key, style in cascaded_styles.items()
+            if (key[0], None) not in self._computed_styles}
+        if self._hidden_elements and target_collector:
+            target_collector.hidden_anchors_collector = (
+                self._set_hidden_computed_styles)
+
+        # Clear the cascaded styles, we don't need them anymore. Keep the
+        # dictionary, it is used later for page margins.
+        self._cascaded_styles.clear()
+
+    def _set_element_styles(self, element, shared_styles=None, ancestors=None,
+                            matches=None):
+        """Add declarations and set computed styles for an element wrapper.
+
+        ``ancestors`` is an optional :class:`AncestorFilter` including the
+        ancestors of ``element``. ``matches`` is an optional list of
+        ``(origin, specificity, pseudo_type, declarations)`` tuples, given when
+        selectors have already been matched against ``element``.
+
+        """
+        if matches is None:
+            matches = self._match(element, ancestors)
+        cascaded_styles = self._cascaded_styles
+        for origin, specificity, pseudo_type, declarations in matches:
+            style = cascaded_styles.setdefault(
+                (element.etree_element, pseudo_type), {})
+            for name, values, importance in declarations:
+                precedence = declaration_precedence(origin, importance)
+                weight = (precedence, specificity)
+                old_weight = style.get(name, (None, None))[1]
+                if old_weight is None or old_weight <= weight:
+                    style[name] = values, weight
+        parent = element.parent.etree_element if element.parent else None
+        self.set_computed_styles(
+            element.etree_element, root=self._root, parent=parent,
+            base_url=self._base_url, target_collector=self._target_collector,
+            shared_styles=shared_styles)
+        return self._computed_styles[element.etree_element, None]
+
+    def _match(self, element, ancestors=None):
+        """Match selectors of all stylesheets against element.
+
+        Return a list of ``(origin, specificity, pseudo_type, declarations)``
+        tuples.
+
+        """
+        matches = []
+        for sheet, origin, sheet_specificity in self._sheets:
+            if ancestors is not None and isinstance(sheet.matcher, Matcher):
+                selectors = sheet.matcher.match(element, ancestors)
+            else:
+                selectors = sheet.matcher.match(element)
+            for specificity, _, pseudo_type, declarations in selectors:
+                matches.append((
+                    origin, sheet_specificity or specificity, pseudo_type,
+                    declarations))
+        return matches
+
+    def _match_in_processes(self, html, processes):
+        """Match selectors against descendants of body in forked processes.
+
+        The children of body are split into chunks, whose elements are matched
+        by different processes. Return a dictionary whose keys are elements
+        and whose values are lists given by :meth:`_match`.
+
+        """
+        global _match_state
+
+        body = next((
+            child for child in html.wrapper_element.iter_children()
+            if child.local_name == 'body'), None)
+        if body is None:
+            return {}
+        if not all(isinstance(sheet.matcher, Matcher) for sheet, _, _ in self._sheets):
+            return {}
+        if sum(1 for _ in body.etree_element.iter()) < CASCADE_PROCESSES_MIN_ELEMENTS:
+            # Starting processes takes longer than matching small documents.
+            return {}
+        if threading.active_count() > 1:
+            # Forking multi-threaded processes may lead to deadlocks.
+            LOGGER.debug('Multiple threads are running, cascade not parallel')
+            return {}
+        try:
+            context = multiprocessing.get_context('fork')
+        except ValueError:
+            LOGGER.debug('Forked processes are not available, cascade not parallel')
+            return {}
+
+        children = list(body.iter_children())
+        size = max(1, -(-len(children) // (4 * processes)))
+        chunks = [children[i:i + size] for i in range(0, len(children), size)]
+        payloads = [sheet.matcher.payloads() for sheet, _, _ in self._sheets]
+        matches = {}
+        _match_state = self._sheets, chunks
+        try:
+            with ProcessPoolExecutor(processes, mp_context=context) as executor:
+                results = executor.map(_match_chunk, range(len(chunks)))
+                for chunk, chunk_matches in zip(chunks, results):
+                    elements = (
+                        element.etree_element
+                        for child in chunk for element in child.iter_subtree())
+                    for element, element_matches in zip(elements, chunk_matches):
+                        matches[element] = [
+                            (self._sheets[index][1],
+                             self._sheets[index][2] or specificity, pseudo_type,
+                             payloads[index][order])
+                            for index, specificity, order, pseudo_type
+                            in element_matches]
+        finally:
+            _match_state = None
+        return matches
+
+    def _set_pseudo_element_styles(self, elements=None):
+        """Set computed styles for pseudo-elements with cascaded styles.
+
+        If ``elements`` is given, only set styles for pseudo-elements of these
+        elements.
+
+        """
         # Pseudo-elements inherit from their associated element so they come
         # last. Do them in a second pass as there is no easy way to iterate
         # on the pseudo-elements for a given element with the current structure
@@ -111,19 +296,39 @@ class StyleFor:
 
         # Only iterate on pseudo-elements that have cascaded styles. (Others
         # might as well not exist.)
-        for element, pseudo_type in cascaded_styles:
-            if pseudo_type:
+        for element, pseudo_type in tuple(self._cascaded_styles):
+            if pseudo_type and (elements is None or element in elements):
                 self.set_computed_styles(
                     element, pseudo_type=pseudo_type,
                     # The pseudo-element inherits from the element.
-                    root=html.etree_element, parent=element,
-                    base_url=html.base_url, target_collector=target_collector)
-
-        # Clear the cascaded styles, we don't need them anymore. Keep the
-        # dictionary, it is used later for page margins.
-        self._cascaded_styles.clear()
+                    root=self._root, parent=element, base_url=self._base_url,
+                    target_collector=self._target_collector)
+
+    def _set_hidden_computed_styles(self):
+        """Set computed styles for elements in subtrees not displayed."""
+        hidden_elements, self._hidden_elements = self._hidden_elements, []
+        if not hidden_elements:
+            return
+        if self._target_collector:
+            self._target_collector.hidden_anchors_collector = None
+        cascaded_styles = self._cascaded_styles
+        cascaded_styles.update(self._hidden_cascaded_styles)
+        self._hidden_cascaded_styles = {}
+        elements = set()
+        shared_styles = {}
+        for hidden_element in hidden_elements:
+            for element in hidden_element.iter_subtree():
+                if element is not hidden_element:
+                    self._set_element_styles(element, shared_styles)
+                    elements.add(element.etree_element)
+        self._set_pseudo_element_styles(elements)
+        for key in tuple(cascaded_styles):
+            if key[0] in elements:
+                del cascaded_styles[key]
 
     def __call__(self, element, pseudo_type=None):
+        if self._hidden_elements and (element, None) not in self._computed_styles:
+            self._set_hidden_computed_styles()
         if style := self._computed_styles.get((element, pseudo_type)):
             if 'table' in style['display'] and style['border_collapse'] == 'collapse':
                 # Padding does not apply.
@@ -138,13 +343,18 @@ class StyleFor:
         return style
 
     def set_computed_styles(self, element, parent, root=None, pseudo_type=None,
-                            base_url=None, target_collector=None):
+                            base_url=None, target_collector=None,
+                            shared_styles=None):
         """Set the computed values of styles to ``element``.
 
         Take the properties left by ``apply_style_rule`` on an element or
         pseudo-element and assign computed values with respect to the cascade,
         declaration priority (ie. ``!important``) and selector specificity.
 
+        If ``shared_styles`` is a dict, elements with the same parent style and
+        the same cascaded declarations share the same computed style, stored
+        in this dict.
+
         """
         cascaded_styles = self.get_cascaded_styles()
         computed_styles = self.get_computed_styles()
@@ -162,9 +372,22 @@ class StyleFor:
             root_style = computed_styles[root, None]
 
         cascaded = cascaded_styles.get((element, pseudo_type), {})
-        computed_styles[element, pseudo_type] = computed_from_cascaded(
+        key = None
+        if shared_styles is not None and parent_style is not None:
+            if pseudo_type is None and ELEMENT_DEPENDENT.isdisjoint(cascaded):
+                # Declared values are shared by all the elements matched by
+                # the same rules, their identity is enough to compare them.
+                key = (id(parent_style), frozenset(
+                    (name, id(values)) for name, (values, _) in cascaded.items()))
+                if (style := shared_styles.get(key)) is not None:
+                    computed_styles[element, pseudo_type] = style
+                    return
+
+        style = computed_styles[element, pseudo_type] = computed_from_cascaded(
             element, cascaded, parent_style, pseudo_type, root_style, base_url,
             target_collector)
+        if key is not None:
+            shared_styles[key] = style
 
     def add_page_declarations(self, page_type):
         for sheet, origin, sheet_specificity in self._sheets:
@@ -182,6 +405,12 @@ class StyleFor:
                             if old_weight is None or old_weight <= weight:
                                 style[name] = values, weight
 
+    def get_page_declarations(self):
+        """Yield declarations of @page rules, including margin rules."""
+        for sheet, _, _ in self._sheets:
+            for _rule, _selector_list, declarations in sheet.page_rules:
+                yield from declarations
+
     def get_cascaded_styles(self):
         return self._cascaded_styles
 
@@ -245,10 +474,11 @@ def text_decoration(key, value, parent_value, cascaded):
 
 
 def find_stylesheets(wrapper_element, device_media_type, url_fetcher, base_url,
-                     font_config, counter_style, page_rules):
+                     font_config, counter_style, page_rules, cache=None):
     """Yield the stylesheets in ``element_tree``.
 
-    The output order is the same as the source order.
+    The output order is the same as the source order. Preprocessed
+    stylesheets are stored in ``cache`` if given.
 
     """
     from ..html import element_has_link_type
@@ -273,7 +503,7 @@ def find_stylesheets(wrapper_element, device_media_type, url_fetcher, base_url,
                 string=content, base_url=base_url,
                 url_fetcher=url_fetcher, media_type=device_media_type,
                 font_config=font_config, counter_style=counter_style,
-                page_rules=page_rules)
+                page_rules=page_rules, cache=cache)
             yield css
         elif element.tag == 'link' and element.get('href'):
             if not element_has_link_type(element, 'stylesheet') or \
@@ -286,7 +516,7 @@ def find_stylesheets(wrapper_element, device_media_type, url_fetcher, base_url,
                         url=href, url_fetcher=url_fetcher,
                         _check_mime_type=True, media_type=device_media_type,
                         font_config=font_config, counter_style=counter_style,
-                        page_rules=page_rules)
+                        page_rules=page_rules, cache=cache)
                 except URLFetchingError as exception:
                     LOGGER.error('Failed to load stylesheet at %s: %s', href, exception)
                     LOGGER.debug('Error while loading stylesheet:', exc_info=exception)
@@ -592,15 +822,32 @@ def resolve_var(computed, token, parent_style):
     args = parse_function(token)[1]
     variable_name = args.pop(0).value.replace('-', '_')  # first arg is name
     default = args  # next args are default value
+    if computed_value := computed[variable_name]:
+        # Variables are already resolved in computed custom properties.
+        return computed_value
     computed_value = []
-    for value in (computed[variable_name] or default):
+    for value in default:
         resolved = resolve_var(computed, value, parent_style)
         computed_value.extend((value,) if resolved is None else resolved)
     return computed_value
 
 
+# Specified values of styles whose specified position, float and display are
+# the same as their computed values, shared to avoid an empty dict per style.
+NO_SPECIFIED_VALUES = MappingProxyType({})
+
+
 class AnonymousStyle(dict):
-    """Computed style used for anonymous boxes."""
+    """Computed style used for anonymous boxes.
+
+    Only values that can't be found in the parent style or in the initial
+    values are stored in the dict, other values are found each time they are
+    requested.
+
+    """
+    # Avoid a dict of attributes for each style, there may be many of them.
+    __slots__ = ('parent_style', 'specified')
+
     def __init__(self, parent_style):
         # border-*-style is none, so border-width computes to zero.
         # Other than that, properties that would need computing are
@@ -614,10 +861,6 @@ class AnonymousStyle(dict):
         })
         self.parent_style = parent_style
         self.specified = self
-        if parent_style:
-            self.cache = parent_style.cache
-        else:
-            self.cache = {'ratio_ch': {}, 'ratio_ex': {}}
 
     def copy(self):
         copy = AnonymousStyle(self.parent_style)
@@ -626,23 +869,33 @@ class AnonymousStyle(dict):
 
     def __missing__(self, key):
         if key in INHERITED or key[:2] == '__':
-            value = self[key] = self.parent_style[key]
+            return self.parent_style[key]
         elif key == 'page':
             # page is not inherited but taken from the ancestor if 'auto'
-            value = self[key] = self.parent_style[key]
+            return self.parent_style[key]
         elif key[:16] == 'text_decoration_':
             value = self[key] = text_decoration(
                 key, INITIAL_VALUES[key], self.parent_style[key], cascaded=False)
+            return value
         else:
-            value = self[key] = INITIAL_VALUES[key]
-        return value
+            return INITIAL_VALUES[key]
 
 
 class ComputedStyle(dict):
-    """Computed style used for non-anonymous boxes."""
+    """Computed style used for non-anonymous boxes.
+
+    Inherited values that are not cascaded and initial values that don't need
+    to be computed are not stored in the dict, they are found again in the
+    parent style or in the initial values each time they are requested.
+
+    """
+    __slots__ = (
+        'base_url', 'cascaded', 'element', 'is_root_element',
+        'parent_style', 'pseudo_type', 'root_style', 'specified')
+
     def __init__(self, parent_style, cascaded, element, pseudo_type,
                  root_style, base_url):
-        self.specified = {}
+        self.specified = NO_SPECIFIED_VALUES
         self.parent_style = parent_style
         self.cascaded = cascaded
         self.is_root_element = parent_style is None
@@ -650,17 +903,14 @@ class ComputedStyle(dict):
         self.pseudo_type = pseudo_type
         self.root_style = root_style
         self.base_url = base_url
-        if parent_style:
-            self.cache = parent_style.cache
-        else:
-            self.cache = {'ratio_ch': {}, 'ratio_ex': {}}
 
     def copy(self):
         copy = ComputedStyle(
             self.parent_style, self.cascaded, self.element, self.pseudo_type,
             self.root_style, self.base_url)
         copy.update(self)
-        copy.specified = self.specified.copy()
+        if self.specified:
+            copy.specified = self.specified.copy()
         return copy
 
     def __missing__(self, key):
@@ -672,6 +922,7 @@ class ComputedStyle(dict):
             self['float']
 
         parent_style = self.parent_style
+        computed = False
 
         if key in self.cascaded:
             # Property defined in cascaded properties.
@@ -690,6 +941,23 @@ class ComputedStyle(dict):
             # On the root element, 'inherit' from initial values
             value = 'initial'
 
+        if key[:2] == '__' and key in self.cascaded:
+            if any(check_var_function(token) for token in value):
+                # Substitute variables in custom properties once, children
+                # inherit them and don't have to resolve them again. Set an
+                # empty value first, as variables referencing themselves are
+                # invalid.
+                self[key] = []
+                solved_tokens = []
+                for token in value:
+                    tokens = resolve_var(self, token, parent_style)
+                    if tokens is None:
+                        solved_tokens.append(token)
+                    else:
+                        solved_tokens.extend(tokens)
+                del self[key]
+                value = solved_tokens
+
         if pending:
             # Property with pending values, validate them.
             solved_tokens = []
@@ -705,28 +973,27 @@ class ComputedStyle(dict):
             except InvalidValues:
                 if key in INHERITED and parent_style is not None:
                     # Values in parent_style are already computed.
-                    self[key] = value = parent_style[key]
+                    value = parent_style[key]
+                    computed = True
                 else:
                     value = INITIAL_VALUES[key]
-                    if key not in INITIAL_NOT_COMPUTED:
-                        # The value is the same as when computed.
-                        self[key] = value
+                    # The value is the same as when computed.
+                    computed = key not in INITIAL_NOT_COMPUTED
 
         if value == 'initial':
             value = [] if key[:2] == '__' else INITIAL_VALUES[key]
-            if key not in INITIAL_NOT_COMPUTED:
-                # The value is the same as when computed.
-                self[key] = value
+            # The value is the same as when computed.
+            computed = key not in INITIAL_NOT_COMPUTED
         elif value == 'inherit':
             # Values in parent_style are already computed.
-            self[key] = value = parent_style[key]
+            value = parent_style[key]
+            computed = True
 
         if key[:16] == 'text_decoration_' and parent_style is not None:
             # Text decorations are not inherited but propagated. See
             # https://www.w3.org/TR/css-text-decor-3/#line-decoration.
             value = text_decoration(key, value, parent_style[key], key in self.cascaded)
-            if key in self:
-                del self[key]
+            computed = False
         elif key == 'page' and value == 'auto':
             # The page property does not inherit. However, if the page value on
             # an element is auto, then its used value is the value specified on
@@ -734,23 +1001,26 @@ class ComputedStyle(dict):
             # root element, the used value for auto is the empty string. See
             # https://www.w3.org/TR/css-page-3/#using-named-pages.
             value = '' if parent_style is None else parent_style['page']
-            if key in self:
-                del self[key]
-        elif key in ('position', 'float', 'display'):
-            # Save specified values to define computed values for these
-            # specific properties. See
-            # https://www.w3.org/TR/CSS21/visuren.html#dis-pos-flo.
-            self.specified[key] = value
+            computed = False
 
-        if key in self:
-            # Value already computed and saved: return.
-            return self[key]
+        specified = value
 
-        if key in COMPUTER_FUNCTIONS:
-            # Value not computed yet: compute.
-            value = COMPUTER_FUNCTIONS[key](self, key, value)
+        if not computed:
+            if key in COMPUTER_FUNCTIONS:
+                # Value not computed yet: compute.
+                value = COMPUTER_FUNCTIONS[key](self, key, value)
+            # Only store values that can't be found again in the parent style
+            # or in the initial values.
+            self[key] = value
+
+        if key in ('position', 'float', 'display') and specified != value:
+            # Save specified values different from computed values, needed to
+            # define computed values for these specific properties. See
+            # https://www.w3.org/TR/CSS21/visuren.html#dis-pos-flo.
+            if not self.specified:
+                self.specified = {}
+            self.specified[key] = specified
 
-        self[key] = value
         return value
 
 
@@ -1115,10 +1385,14 @@ def preprocess_stylesheet(device_media_type, base_url, stylesheet_rules, url_fet
 
 def get_all_computed_styles(html, user_stylesheets=None, presentational_hints=False,
                             font_config=None, counter_style=None, page_rules=None,
-                            target_collector=None, forms=False):
+                            target_collector=None, forms=False,
+                            stylesheet_cache=None, processes=None):
     """Compute all the computed styles of all elements in ``html`` document.
 
     Do everything from finding author stylesheets to parsing and applying them.
+    Author stylesheets are stored in ``stylesheet_cache`` if given. Selectors
+    are matched against elements by multiple processes if a number of
+    ``processes`` is given.
 
     Return a ``style_for`` function that takes an element and an optional
     pseudo-element type, and return a style dict object.
@@ -1138,9 +1412,11 @@ def get_all_computed_styles(html, user_stylesheets=None, presentational_hints=Fa
             sheets.append((sheet, 'author', (0, 0, 0)))
     for sheet in find_stylesheets(
             html.wrapper_element, html.media_type, html.url_fetcher,
-            html.base_url, font_config, counter_style, page_rules):
+            html.base_url, font_config, counter_style, page_rules,
+            stylesheet_cache):
         sheets.append((sheet, 'author', None))
     for sheet in (user_stylesheets or []):
         sheets.append((sheet, 'user', None))
 
-    return StyleFor(html, sheets, presentational_hints, target_collector)
+    return StyleFor(
+        html, sheets, presentational_hints, target_collector, processes)
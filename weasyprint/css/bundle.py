@@ -0,0 +1,138 @@
+"""Store preprocessed stylesheets in bundles.
+
+Bundles include the validated declarations of style rules, the sources of
+their selectors, ``@page`` rules, ``@font-face`` rules and ``@counter-style``
+definitions. Loading a bundle avoids the parsing and the validation of the
+stylesheets, only selectors are compiled again.
+
+Bundles are pickled Python objects, they must only be loaded from trusted
+sources, with the version of WeasyPrint used to create them.
+
+"""
+
+import argparse
+import pickle
+
+import tinycss2
+
+from .. import CSS, VERSION, _FontFaceRecorder, default_url_fetcher
+from .matcher import Matcher, compile_selector_list
+
+
+class _RecordingMatcher(Matcher):
+    """Matcher recording the sources of the added selectors."""
+    def __init__(self):
+        super().__init__()
+        self.rules = []
+
+    def add_selector(self, selector, payload):
+        super().add_selector(selector, payload)
+        source, index = selector.source
+        if not isinstance(source, str):
+            source = tinycss2.serialize(source)
+        self.rules.append((source, index, payload))
+
+
+def write_bundle(target, stylesheets, base_url=None, media_type='print',
+                 url_fetcher=default_url_fetcher):
+    """Preprocess stylesheets and store them in a bundle.
+
+    :type target: :class:`str`, :class:`pathlib.Path` or :term:`file object`
+    :param target: The filename or binary file object of the bundle.
+    :param list stylesheets:
+        Filenames, URLs or file objects of stylesheets. They are applied in
+        this order, as if they were concatenated.
+    :param str base_url:
+        The base URL used to resolve relative URLs in stylesheets. The base
+        URL of each stylesheet is used by default. Resolved URLs are stored in
+        the bundle and must be available when the bundle is used.
+    :param str media_type: The media type used to evaluate media queries.
+    :param url_fetcher: A function or other callable used to fetch URLs.
+
+    """
+    matcher = _RecordingMatcher()
+    page_rules = []
+    font_faces = _FontFaceRecorder(None)
+    counter_style = {}
+    base_urls = []
+    for stylesheet in stylesheets:
+        css = CSS(
+            guess=stylesheet, base_url=base_url, url_fetcher=url_fetcher,
+            media_type=media_type, font_config=font_faces,
+            counter_style=counter_style, matcher=matcher, page_rules=page_rules)
+        base_urls.append(css.base_url)
+    bundle = {
+        'version': VERSION,
+        'base_url': base_urls[0] if base_urls else base_url,
+        'rules': matcher.rules,
+        'page_rules': page_rules,
+        'font_faces': font_faces.rules,
+        'counter_styles': counter_style,
+    }
+    if hasattr(target, 'write'):
+        pickle.dump(bundle, target, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        with open(target, 'wb') as fd:
+            pickle.dump(bundle, fd, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def read_bundle(source):
+    """Read bundle from filename or binary file object.
+
+    Return a ``(base_url, matcher, page_rules, font_faces, counter_styles)``
+    tuple.
+
+    """
+    if hasattr(source, 'read'):
+        bundle = pickle.load(source)
+    else:
+        with open(source, 'rb') as fd:
+            bundle = pickle.load(fd)
+    if not isinstance(bundle, dict) or bundle.get('version') != VERSION:
+        raise ValueError(
+            f'Stylesheet bundle not created by WeasyPrint {VERSION}')
+
+    matcher = Matcher()
+    selectors = {}
+    for source, index, payload in bundle['rules']:
+        if source not in selectors:
+            selectors[source] = compile_selector_list(source)
+        matcher.add_selector(selectors[source][index], payload)
+    return (
+        bundle['base_url'], matcher, bundle['page_rules'], bundle['font_faces'],
+        bundle['counter_styles'])
+
+
+PARSER = argparse.ArgumentParser(
+    prog='weasyprint-compile-css',
+    description='Preprocess stylesheets and store them in a bundle.')
+PARSER.add_argument(
+    'output', help='filename where the bundle is written')
+PARSER.add_argument(
+    'stylesheets', nargs='+',
+    help='filenames or URLs of the stylesheets, applied in this order')
+PARSER.add_argument(
+    '-m', '--media-type', default='print',
+    help='media type used to evaluate media queries, defaults to print')
+PARSER.add_argument(
+    '-u', '--base-url',
+    help='base URL used to resolve relative URLs in stylesheets')
+
+
+def main(argv=None):
+    """The ``weasyprint-compile-css`` program stores stylesheets in a bundle.
+
+    .. code-block:: sh
+
+        weasyprint-compile-css [options] <output> <stylesheet> [...]
+
+    The bundle can then be loaded with :meth:`weasyprint.CSS.from_bundle`.
+
+    """
+    args = PARSER.parse_args(argv)
+    write_bundle(
+        args.output, args.stylesheets, args.base_url, args.media_type)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
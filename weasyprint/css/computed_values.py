@@ -38,6 +38,9 @@ BORDER_WIDTH_KEYWORDS = {
 }
 assert INITIAL_VALUES['border_top_width'] == BORDER_WIDTH_KEYWORDS['medium']
 
+# Ratios of 1ex/font_size and 1ch/font_size, indexed by character and font style.
+CHARACTER_RATIOS = {}
+
 # https://www.w3.org/TR/CSS21/fonts.html#propdef-font-weight
 FONT_WEIGHT_RELATIVE = {
     'bolder': {
@@ -521,8 +524,8 @@ def content(style, name, values):
 def display(style, name, value):
     """Compute the ``display`` property."""
     # See https://www.w3.org/TR/CSS21/visuren.html#dis-pos-flo.
-    float_ = style.specified['float']
-    position = style.specified['position']
+    float_ = style.specified.get('float', style['float'])
+    position = style.specified.get('position', style['position'])
     if position in ('absolute', 'fixed') or float_ != 'none' or (
             style.is_root_element):
         if value == ('inline-table',):
@@ -541,7 +544,7 @@ def display(style, name, value):
 def compute_float(style, name, value):
     """Compute the ``float`` property."""
     # See https://www.w3.org/TR/CSS21/visuren.html#dis-pos-flo.
-    position = style.specified['position']
+    position = style.specified.get('position', style['position'])
     if position in ('absolute', 'fixed') or position[0] == 'running()':
         return 'none'
     else:
@@ -798,10 +801,10 @@ def character_ratio(style, character):
 
     assert character in ('x', '0')
 
-    cache = style.cache[f'ratio_{"ex" if character == "x" else "ch"}']
-    cache_key = _font_style_cache_key(style)
-    if cache_key in cache:
-        return cache[cache_key]
+    # Ratios only depend on system fonts, they are shared by documents.
+    cache_key = (character, _font_style_cache_key(style))
+    if cache_key in CHARACTER_RATIOS:
+        return CHARACTER_RATIOS[cache_key]
 
     # Avoid recursion for letter-spacing and word-spacing properties
     style = style.copy()
@@ -827,5 +830,5 @@ def character_ratio(style, character):
     # Zero means some kind of failure, fallback is 0.5.
     # We round to try keeping exact values that were altered by Pango.
     ratio = round(measure / style['font_size'], 5) or 0.5
-    cache[cache_key] = ratio
+    CHARACTER_RATIOS[cache_key] = ratio
     return ratio
@@ -0,0 +1,139 @@
+"""Match selectors against elements, knowing their ancestors.
+
+Selectors are stored with the tag names, ids and classes their ancestors must
+have. During the cascade, a filter keeps the tag names, ids and classes of the
+ancestors of the current element, so that descendant selectors whose required
+ancestors are missing are rejected without walking up the tree.
+
+"""
+
+import threading
+
+import cssselect2
+from cssselect2 import parser
+from cssselect2.compiler import CompiledSelector
+
+
+def _ascii_lower(string):
+    """Transform (only) ASCII letters to lower case, as cssselect2 does."""
+    return string.encode().lower().decode()
+
+
+def _compound_keys(compound):
+    """Yield the filter keys required by a compound selector."""
+    for simple_selector in compound.simple_selectors:
+        if isinstance(simple_selector, parser.LocalNameSelector):
+            yield simple_selector.lower_local_name
+        elif isinstance(simple_selector, parser.IDSelector):
+            yield f'#{simple_selector.ident}'
+        elif isinstance(simple_selector, parser.ClassSelector):
+            yield f'.{simple_selector.class_name}'
+
+
+def _ancestor_keys(node):
+    """Get the filter keys required by the ancestors of a selector."""
+    keys = set()
+    while isinstance(node, parser.CombinedSelector):
+        left = node.left
+        # Compounds followed by sibling combinators are not ancestors.
+        if node.combinator in (' ', '>'):
+            compound = left.right if isinstance(left, parser.CombinedSelector) else left
+            keys.update(_compound_keys(compound))
+        node = left
+    return tuple(keys)
+
+
+def compile_selector_list(input):
+    """Compile a list of selectors, storing the keys required by ancestors.
+
+    The source of each selector, the input and the index of the selector in
+    the list, is stored too.
+
+    """
+    selectors = []
+    for index, parsed_selector in enumerate(parser.parse(input)):
+        selector = CompiledSelector(parsed_selector)
+        selector.ancestor_keys = _ancestor_keys(parsed_selector.parsed_tree)
+        selector.source = (input, index)
+        selectors.append(selector)
+    return selectors
+
+
+class AncestorFilter:
+    """Tag names, ids and classes of the ancestors of the current element.
+
+    Keys are counted, as the same key can be given by multiple ancestors.
+
+    """
+    def __init__(self):
+        self._counts = {}
+        self._stack = []
+
+    def push(self, element):
+        """Add element, before handling its children."""
+        keys = [_ascii_lower(element.local_name)]
+        if element.id:
+            keys.append(f'#{element.id}')
+        keys.extend(f'.{class_name}' for class_name in element.classes)
+        counts = self._counts
+        for key in keys:
+            counts[key] = counts.get(key, 0) + 1
+        self._stack.append(keys)
+
+    def pop(self):
+        """Remove the last added element, after handling its children."""
+        counts = self._counts
+        for key in self._stack.pop():
+            if counts[key] == 1:
+                del counts[key]
+            else:
+                counts[key] -= 1
+
+    def may_match(self, keys):
+        """Whether all the required keys are given by ancestors."""
+        counts = self._counts
+        return all(key in counts for key in keys)
+
+
+class Matcher(cssselect2.Matcher):
+    """Selectors storage able to reject selectors without ancestors."""
+    def __init__(self):
+        super().__init__()
+        # Filter of the element being matched, set for each thread.
+        self._filter = threading.local()
+
+    def add_selector(self, selector, payload):
+        keys = getattr(selector, 'ancestor_keys', ())
+        super().add_selector(selector, (payload, keys))
+
+    def match(self, element, ancestors=None):
+        """Match selectors against element.
+
+        If ``ancestors`` is an :class:`AncestorFilter` including the ancestors
+        of ``element``, it is used to reject selectors quickly.
+
+        """
+        self._filter.ancestors = ancestors
+        try:
+            return super().match(element)
+        finally:
+            self._filter.ancestors = None
+
+    def payloads(self):
+        """Get a dictionary of payloads, indexed by the order of selectors."""
+        entries_lists = (
+            *self.id_selectors.values(), *self.class_selectors.values(),
+            *self.lower_local_name_selectors.values(),
+            *self.namespace_selectors.values(), self.lang_attr_selectors,
+            self.other_selectors)
+        return {
+            order: payload for entries in entries_lists
+            for _, _, order, _, (payload, _) in entries}
+
+    def add_relevant_selectors(self, element, selectors, relevant_selectors):
+        ancestors = getattr(self._filter, 'ancestors', None)
+        for test, specificity, order, pseudo, (payload, keys) in selectors:
+            if keys and ancestors is not None and not ancestors.may_match(keys):
+                continue
+            if test(element):
+                relevant_selectors.append((specificity, order, pseudo, payload))
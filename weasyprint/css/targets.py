@@ -87,6 +87,11 @@ class TargetCollector:
         # to call the needed parse_again functions.
         self.had_pending_targets = False
 
+        # Function collecting anchors of elements whose styles have not been
+        # computed because they are not displayed, called when an unknown
+        # anchor is looked up.
+        self.hidden_anchors_collector = None
+
     def collect_anchor(self, anchor_name):
         """Create a TargetLookupItem for the given `anchor_name``."""
         if isinstance(anchor_name, str):
@@ -105,6 +110,9 @@ class TargetCollector:
 
         """
         anchor_name = anchor_name_from_token(anchor_token)
+        if anchor_name not in self.target_lookup_items:
+            if self.hidden_anchors_collector is not None:
+                self.hidden_anchors_collector()
         item = self.target_lookup_items.get(
             anchor_name, TargetLookupItem('undefined'))
 
@@ -104,6 +104,9 @@ class Pending(ABC):
         self.tokens = tokens
         self.name = name
         self._reported_error = False
+        # Validated values, shared by all the elements using this declaration.
+        # keys: (wanted_key, serialized tokens)
+        self._solved = {}
 
     @abstractmethod
     def validate(self, tokens, wanted_key):
@@ -112,12 +115,16 @@ class Pending(ABC):
 
     def solve(self, tokens, wanted_key):
         """Get validated value or raise error."""
+        key = (wanted_key, tuple(token.serialize() for token in tokens))
+        if key in self._solved:
+            return self._solved[key]
         try:
             if not tokens:
                 # Having no tokens is allowed by grammar but refused by all
                 # properties and expanders.
                 raise InvalidValues('no value')
-            return self.validate(tokens, wanted_key)
+            value = self._solved[key] = self.validate(tokens, wanted_key)
+            return value
         except InvalidValues as exc:
             if self._reported_error:
                 raise exc
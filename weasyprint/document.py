@@ -2,8 +2,10 @@
 
 import functools
 import io
-from hashlib import md5
+import os
+from hashlib import md5, sha256
 from pathlib import Path
+from tempfile import NamedTemporaryFile
 
 from . import CSS, DEFAULT_OPTIONS
 from .anchors import gather_anchors, make_page_bookmark_tree
@@ -13,11 +15,12 @@ from .css.targets import TargetCollector
 from .draw import draw_page, stacked
 from .formatting_structure.build import build_formatting_structure
 from .html import get_html_metadata
+from .images import find_image_urls, prefetch_images
 from .images import get_image_from_uri as original_get_image_from_uri
 from .layout import LayoutContext, layout_document
-from .logger import PROGRESS_LOGGER
+from .logger import PROGRESS_LOGGER, measure
 from .matrix import Matrix
-from .pdf import VARIANTS, generate_pdf
+from .pdf import VARIANTS, generate_pdf, serialize_streams
 from .pdf.metadata import generate_rdf_metadata
 from .text.fonts import FontConfiguration
 
@@ -30,7 +33,7 @@ class Page:
 
     """
 
-    def __init__(self, page_box):
+    def __init__(self, page_box, font_config=None):
         #: The page width, including margins, in CSS pixels.
         self.width = page_box.margin_width()
 
@@ -77,6 +80,10 @@ class Page:
         #: The key ``None`` will contain inputs that are not part of a form.
         self.forms = {None: []}
 
+        #: The :class:`text.fonts.FontConfiguration` used to lay out the page,
+        #: to give to :class:`Document` when the page is exported.
+        self.font_config = font_config
+
         gather_anchors(page_box, self.anchors, self.links, self.bookmarks, self.forms)
         self._page_box = page_box
 
@@ -192,6 +199,100 @@ class DiskCache:
             pass
 
 
+# Persistent cache folders already cleaned by the current process.
+_evicted_folders = set()
+
+
+class PersistentCache:
+    """Dict-like storing bytestrings on disk, shared between renderings.
+
+    Contrary to :class:`DiskCache`, files are kept when the cache is deleted,
+    and can be shared between processes. Each value is written atomically in
+    its own file, and the least recently used files are removed when the
+    total size of the folder exceeds ``max_size`` bytes.
+
+    """
+
+    def __init__(self, folder, max_size=None):
+        self._path = Path(folder)
+        self._path.mkdir(parents=True, exist_ok=True)
+        self._max_size = 512 * 1024 * 1024 if max_size is None else max_size
+        self._written_size = 0
+        # Caches are often opened for only one rendering, writing less than
+        # the eviction threshold: evict old files the first time the cache is
+        # opened by the current process.
+        if (self._path, self._max_size) not in _evicted_folders:
+            _evicted_folders.add((self._path, self._max_size))
+            self.evict()
+
+    def _path_from_key(self, key):
+        digest = sha256(key.encode()).hexdigest()
+        return self._path / digest[:2] / digest
+
+    def __getitem__(self, key):
+        path = self._path_from_key(key)
+        try:
+            value = path.read_bytes()
+            # Update access time for LRU eviction.
+            os.utime(path)
+        except OSError:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        path = self._path_from_key(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            with NamedTemporaryFile(dir=path.parent, delete=False) as fd:
+                fd.write(value)
+            os.replace(fd.name, path)
+        except OSError:
+            # Silently ignore errors while writing cache
+            return
+        self._written_size += len(value)
+        if self._written_size > self._max_size / 16:
+            self._written_size = 0
+            self.evict()
+
+    def __contains__(self, key):
+        return self._path_from_key(key).exists()
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def evict(self):
+        """Remove least recently used files until the size limit is met."""
+        files = []
+        for path in self._path.glob('*/*'):
+            try:
+                stat = path.stat()
+            except OSError:
+                # Removed by another process
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in sorted(files):
+            if size <= self._max_size:
+                break
+            path.unlink(missing_ok=True)
+            size -= file_size
+
+
+def open_persistent_cache(options):
+    """Replace the folder given as ``persistent_cache`` option by its cache.
+
+    The cache is opened once and shared by the rendering and the PDF
+    generation using these options.
+
+    """
+    if isinstance(options['persistent_cache'], (str, Path)):
+        options['persistent_cache'] = PersistentCache(
+            options['persistent_cache'], options['persistent_cache_size'])
+
+
 class Document:
     """A rendered document ready to be painted in a pydyf stream.
 
@@ -213,27 +314,40 @@ class Document:
             cache = {}
         elif not isinstance(cache, (dict, DiskCache)):
             cache = DiskCache(cache)
+        open_persistent_cache(options)
         for css in options['stylesheets'] or []:
             if not hasattr(css, 'matcher'):
                 css = CSS(
                     guess=css, media_type=html.media_type,
-                    font_config=font_config, counter_style=counter_style)
+                    font_config=font_config, counter_style=counter_style,
+                    cache=options['stylesheet_cache'])
             user_stylesheets.append(css)
-        style_for = get_all_computed_styles(
-            html, user_stylesheets, options['presentational_hints'],
-            font_config, counter_style, page_rules, target_collector,
-            options['pdf_forms'])
+        with measure(options['metrics'], 'cascade') as counters:
+            style_for = get_all_computed_styles(
+                html, user_stylesheets, options['presentational_hints'],
+                font_config, counter_style, page_rules, target_collector,
+                options['pdf_forms'], options['stylesheet_cache'],
+                options['cascade_processes'])
+            counters['styles'] = len(style_for.get_computed_styles())
+        url_fetcher = html.url_fetcher
+        if options['prefetch']:
+            with measure(options['metrics'], 'prefetch') as counters:
+                urls = {
+                    url: None for url in find_image_urls(style_for, html.base_url)
+                    if url not in cache}
+                counters['urls'] = len(urls)
+                url_fetcher = prefetch_images(urls, url_fetcher, options['prefetch'])
         get_image_from_uri = functools.partial(
             original_get_image_from_uri, cache=cache,
-            url_fetcher=html.url_fetcher, options=options)
+            url_fetcher=url_fetcher, options=options)
         PROGRESS_LOGGER.info('Step 4 - Creating formatting structure')
         context = LayoutContext(
             style_for, get_image_from_uri, font_config, counter_style,
-            target_collector)
+            target_collector, options['metrics'])
         return context
 
     @classmethod
-    def _render(cls, html, font_config, counter_style, options):
+    def _render_pages(cls, html, font_config, counter_style, options):
         if font_config is None:
             font_config = FontConfiguration()
 
@@ -243,15 +357,27 @@ class Document:
         context = cls._build_layout_context(
             html, font_config, counter_style, options)
 
-        root_box = build_formatting_structure(
-            html.etree_element, context.style_for, context.get_image_from_uri,
-            html.base_url, context.target_collector, counter_style,
-            context.footnotes)
+        with measure(context.metrics, 'boxes') as counters:
+            root_box = build_formatting_structure(
+                html.etree_element, context.style_for, context.get_image_from_uri,
+                html.base_url, context.target_collector, counter_style,
+                context.footnotes)
+            if context.metrics is not None:
+                counters['boxes'] = sum(1 for _ in root_box.descendants())
+
+        with measure(context.metrics, 'layout', pages=0) as counters:
+            for page_box in layout_document(html, root_box, context):
+                counters['pages'] += 1
+                yield Page(page_box, font_config)
 
-        page_boxes = layout_document(html, root_box, context)
+    @classmethod
+    def _render(cls, html, font_config, counter_style, options):
+        if font_config is None:
+            font_config = FontConfiguration()
+
+        pages = list(cls._render_pages(html, font_config, counter_style, options))
         rendering = cls(
-            [Page(page_box) for page_box in page_boxes],
-            DocumentMetadata(**get_html_metadata(html)),
+            pages, DocumentMetadata(**get_html_metadata(html)),
             html.url_fetcher, font_config)
         rendering._html = html
         return rendering
@@ -379,6 +505,7 @@ class Document:
         new_options = DEFAULT_OPTIONS.copy()
         new_options.update(options)
         options = new_options
+        open_persistent_cache(options)
 
         # Set default PDF version for PDF variants.
         if variant := options['pdf_variant']:
@@ -388,22 +515,41 @@ class Document:
             if 'identifier' in properties and not options['pdf_identifier']:
                 options['pdf_identifier'] = properties['identifier']
 
-        pdf = generate_pdf(self, target, zoom, **options)
+        if options['streaming_pdf'] and not hasattr(target, 'write'):
+            # Streams are written while the PDF is generated, the output has
+            # to be available before the generation starts.
+            if target is None:
+                output = io.BytesIO()
+                self.write_pdf(output, zoom, finisher, **options)
+                return output.getvalue()
+            with open(target, 'wb') as fd:
+                self.write_pdf(fd, zoom, finisher, **options)
+            return
+
+        metrics = options['metrics']
+        with measure(metrics, 'pdf') as counters:
+            pdf = generate_pdf(self, target, zoom, **options)
+            counters.update(pages=len(self.pages), fonts=len(self.fonts))
 
         if finisher:
             finisher(self, pdf)
 
+        if (workers := options['workers']) and workers > 1:
+            with measure(metrics, 'serialize', workers=workers):
+                serialize_streams(pdf, workers)
+
         identifier = options['pdf_identifier']
         compress = not options['uncompressed_pdf']
         version = options['pdf_version']
 
-        if target is None:
-            output = io.BytesIO()
-            pdf.write(output, version, identifier, compress)
-            return output.getvalue()
+        with measure(metrics, 'write', objects=len(pdf.objects)):
+            if target is None:
+                output = io.BytesIO()
+                pdf.write(output, version, identifier, compress)
+                return output.getvalue()
 
-        if hasattr(target, 'write'):
-            pdf.write(target, version, identifier, compress)
-        else:
-            with open(target, 'wb') as fd:
-                pdf.write(fd, version, identifier, compress)
+            if hasattr(target, 'write'):
+                pdf.write(target, version, identifier, compress)
+            else:
+                with open(target, 'wb') as fd:
+                    pdf.write(fd, version, identifier, compress)
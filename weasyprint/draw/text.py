@@ -3,8 +3,6 @@
 from io import BytesIO
 from xml.etree import ElementTree
 
-from PIL import Image
-
 from ..images import RasterImage, SVGImage
 from ..matrix import Matrix
 from ..text.ffi import FROM_UNITS, TO_UNITS, ffi, pango
@@ -241,6 +239,8 @@ def draw_first_line(stream, textbox, text_overflow, block_ellipsis, matrix):
             elif font.png:
                 png_data = get_hb_object_data(font.hb_font, 'png', glyph)
                 if png_data:
+                    from PIL import Image
+
                     pillow_image = Image.open(BytesIO(png_data))
                     image_id = f'{font.hash}{glyph}'
                     image = RasterImage(pillow_image, image_id, png_data)
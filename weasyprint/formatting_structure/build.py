@@ -193,6 +193,8 @@ def element_to_box(element, style_for, get_image_from_uri, base_url,
 
         if child_boxes and child_boxes[0].style['float'] == 'footnote':
             footnote = child_boxes[0]
+            # Styles may be shared between elements, copy before changing.
+            footnote.style = footnote.style.copy()
             footnote.style['float'] = 'none'
             footnotes.append(footnote)
             call_style = style_for(element, 'footnote-call')
@@ -527,6 +529,9 @@ def compute_content_list(content_list, parent_box, counter_values, css_token,
             if new_box is None:
                 continue
             new_box = new_box.deepcopy()
+            # Styles may be shared by other running elements, copy before
+            # changing them.
+            new_box.style = new_box.style.copy()
             new_box.style['position'] = 'static'
             if isinstance(new_box, boxes.ParentBox):
                 for child in new_box.descendants():
@@ -1455,6 +1460,7 @@ def set_viewport_overflow(root_box):
                 break
 
     root_box.viewport_overflow = chosen_box.style['overflow']
+    chosen_box.style = chosen_box.style.copy()
     chosen_box.style['overflow'] = 'visible'
     return root_box
 
@@ -8,6 +8,7 @@ are images with intrinsic dimensions.
 """
 
 import re
+import threading
 from importlib.resources import files
 
 from . import CSS, Attachment, css
@@ -18,21 +19,46 @@ from .images import SVGImage
 from .logger import LOGGER
 from .urls import get_url_attribute
 
-HTML5_UA_COUNTER_STYLE = CounterStyle()
 HTML5_UA = (files(css) / 'html5_ua.css').read_text('utf-8')
 HTML5_UA_FORM = (files(css) / 'html5_ua_form.css').read_text('utf-8')
 HTML5_PH = (files(css) / 'html5_ph.css').read_text('utf-8')
-HTML5_UA_STYLESHEET = CSS(
-    string=HTML5_UA, counter_style=HTML5_UA_COUNTER_STYLE)
-HTML5_UA_FORM_STYLESHEET = CSS(
-    string=HTML5_UA_FORM, counter_style=HTML5_UA_COUNTER_STYLE)
-HTML5_PH_STYLESHEET = CSS(string=HTML5_PH)
+
+# User-agent stylesheets are parsed by __getattr__ when they are used for the
+# first time, as parsing them is slow and not needed when nothing is rendered.
+_UA_STYLESHEETS_LOCK = threading.Lock()
 
 # https://html.spec.whatwg.org/multipage/#space-character
 HTML_WHITESPACE = ' \t\n\f\r'
 HTML_SPACE_SEPARATED_TOKENS_RE = re.compile(f'[^{HTML_WHITESPACE}]+')
 
 
+def __getattr__(name):
+    """Parse user-agent stylesheets and store them as module attributes."""
+    if name not in (
+            'HTML5_UA_COUNTER_STYLE', 'HTML5_UA_STYLESHEET',
+            'HTML5_UA_FORM_STYLESHEET', 'HTML5_PH_STYLESHEET'):
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    with _UA_STYLESHEETS_LOCK:
+        if name in globals():
+            # Stylesheet parsed by another thread while waiting for the lock.
+            return globals()[name]
+        if name == 'HTML5_PH_STYLESHEET':
+            globals()[name] = CSS(string=HTML5_PH)
+            return globals()[name]
+        if 'HTML5_UA_STYLESHEET' not in globals():
+            # Counter styles are defined in the main stylesheet, and may be
+            # used by the forms stylesheet.
+            counter_style = CounterStyle()
+            globals()['HTML5_UA_STYLESHEET'] = CSS(
+                string=HTML5_UA, counter_style=counter_style)
+            globals()['HTML5_UA_COUNTER_STYLE'] = counter_style
+        if name == 'HTML5_UA_FORM_STYLESHEET':
+            globals()[name] = CSS(
+                string=HTML5_UA_FORM,
+                counter_style=globals()['HTML5_UA_COUNTER_STYLE'])
+    return globals()[name]
+
+
 def ascii_lower(string):
     r"""Transform (only) ASCII letters to lower case: A-Z is mapped to a-z.
 
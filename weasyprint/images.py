@@ -3,7 +3,8 @@
 import io
 import math
 import struct
-from hashlib import md5
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import md5, sha256
 from io import BytesIO
 from itertools import cycle
 from math import inf
@@ -13,17 +14,18 @@ from urllib.request import url2pathname
 from xml.etree import ElementTree
 
 import pydyf
-from PIL import Image, ImageFile, ImageOps
 from tinycss2.color4 import parse_color
 
 from . import DEFAULT_OPTIONS
 from .layout.percent import percentage
 from .logger import LOGGER
-from .svg import SVG
-from .urls import URLFetchingError, fetch
+from .urls import URLFetchingError, fetch, get_url_attribute
 
-# Don’t crash when converting truncated images
-ImageFile.LOAD_TRUNCATED_IMAGES = True
+# Attributes including URLs of images, for HTML elements displayed as images.
+IMAGE_ATTRIBUTES = {'img': 'src', 'embed': 'src', 'object': 'data'}
+
+# Pillow and SVG modules are imported when images are loaded for the first time,
+# as importing them is slow and not needed for documents without images.
 
 
 class ImageLoadingError(ValueError):
@@ -43,6 +45,21 @@ class ImageLoadingError(ValueError):
 class RasterImage:
     def __init__(self, pillow_image, image_id, image_data, filename=None,
                  cache=None, orientation='none', options=DEFAULT_OPTIONS):
+        self.id = image_id
+        self._cache = {} if cache is None else cache
+        self._jpeg_quality = jpeg_quality = options['jpeg_quality']
+        self._dpi = options['dpi']
+        self.optimize = optimize = options['optimize_images']
+
+        # Converted image data are stored in the persistent cache, with keys
+        # based on the hash of the original data.
+        self._persistent_cache = options['persistent_cache']
+        self._persistent_key = None
+        if self._persistent_cache is not None and image_data is not None:
+            digest = sha256(image_data).hexdigest()
+            self._persistent_key = (
+                f'{digest}-{orientation}-{optimize}-{jpeg_quality}')
+
         # Transpose image
         original_pillow_image = pillow_image
         pillow_image = rotate_pillow_image(pillow_image, orientation)
@@ -52,21 +69,19 @@ class RasterImage:
             # Discard original data, as the image has been transformed
             image_data = filename = None
 
-        self.id = image_id
-        self._cache = {} if cache is None else cache
-        self._jpeg_quality = jpeg_quality = options['jpeg_quality']
-        self._dpi = options['dpi']
-
+        # Converted images lose their format.
+        image_format = pillow_image.format
         if 'transparency' in pillow_image.info:
-            pillow_image = pillow_image.convert('RGBA')
+            mode, image_format = 'RGBA', None
         elif pillow_image.mode in ('1', 'P', 'I'):
-            pillow_image = pillow_image.convert('RGB')
+            mode, image_format = 'RGB', None
+        else:
+            mode = None
 
-        self.mode = pillow_image.mode
+        self.mode = mode or pillow_image.mode
         self.width = pillow_image.width
         self.height = pillow_image.height
         self.ratio = (self.width / self.height) if self.height != 0 else inf
-        self.optimize = optimize = options['optimize_images']
 
         # The presence of the APP14 segment indicates an Adobe image with
         # inverted CMYK data. Specify a Decode Array to invert it again back to
@@ -74,25 +89,37 @@ class RasterImage:
         app14 = getattr(original_pillow_image, 'app', {}).get('APP14')
         self.invert_colors = self.mode == 'CMYK' and app14 is not None
 
-        if pillow_image.format in ('JPEG', 'MPO'):
+        if image_format in ('JPEG', 'MPO'):
             self.format = 'JPEG'
             if image_data is None or optimize or jpeg_quality is not None:
-                image_file = io.BytesIO()
                 options = {'format': 'JPEG', 'optimize': optimize}
                 if self._jpeg_quality is not None:
                     options['quality'] = self._jpeg_quality
-                pillow_image.save(image_file, **options)
-                image_data = image_file.getvalue()
+                image_data = self._save(pillow_image, mode, 'source', **options)
                 filename = None
         else:
             self.format = 'PNG'
-            if image_data is None or optimize or pillow_image.format != 'PNG':
-                image_file = io.BytesIO()
-                pillow_image.save(image_file, format='PNG', optimize=optimize)
-                image_data = image_file.getvalue()
+            if image_data is None or optimize or image_format != 'PNG':
+                image_data = self._save(
+                    pillow_image, mode, 'source', format='PNG', optimize=optimize)
                 filename = None
         self.image_data = self.cache_image_data(image_data, filename)
 
+    def _save(self, pillow_image, mode, slot, **options):
+        """Convert and save Pillow image, return the saved data."""
+        if self._persistent_key:
+            key = f'{self._persistent_key}-{slot}'
+            if (data := self._persistent_cache.get(key)) is not None:
+                return data
+        if mode:
+            pillow_image = pillow_image.convert(mode)
+        image_file = io.BytesIO()
+        pillow_image.save(image_file, **options)
+        data = image_file.getvalue()
+        if self._persistent_key:
+            self._persistent_cache[key] = data
+        return data
+
     def get_intrinsic_size(self, resolution, font_size):
         return self.width / resolution, self.height / resolution, self.ratio
 
@@ -122,7 +149,10 @@ class RasterImage:
             key = f'{self.id}-{slot}-{self._dpi or ""}'
             return LazyImage(self._cache, key, data)
 
-    def get_x_object(self, interpolate, dpi_ratio):
+    def _get_x_object_data(self, dpi_ratio):
+        """Get size, image data and alpha data of the image XObject."""
+        from PIL import Image
+
         if dpi_ratio == 1:
             width, height = self.width, self.height
         else:
@@ -136,6 +166,40 @@ class RasterImage:
             width, height = thumbnail.width, thumbnail.height
             self.image_data = self.cache_image_data(image_file.getvalue())
 
+        if self.format == 'JPEG':
+            return width, height, self.image_data.data, None
+
+        pillow_image = Image.open(io.BytesIO(self.image_data.data))
+        if self.mode in ('RGBA', 'LA'):
+            # Remove alpha channel from image
+            alpha = pillow_image.getchannel('A')
+            pillow_image = pillow_image.convert(self.mode[:-1])
+            return (
+                width, height, self._get_png_data(pillow_image),
+                self._get_png_data(alpha))
+        return width, height, self._get_png_data(pillow_image), None
+
+    def get_x_object(self, interpolate, dpi_ratio):
+        data = None
+        # Original JPEG data is used as is, no need to store it.
+        persistent = self._persistent_key and (
+            self.format != 'JPEG' or dpi_ratio != 1)
+        if persistent:
+            key = f'{self._persistent_key}-x_object-{self._dpi}-{dpi_ratio}'
+            if data := self._persistent_cache.get(key):
+                # Stored data: width, height and image data length, then image
+                # data and alpha data.
+                width, height, length = struct.unpack('!III', data[:12])
+                image_data = data[12:12 + length]
+                alpha_data = data[12 + length:] or None
+        if not data:
+            width, height, image_data, alpha_data = self._get_x_object_data(
+                dpi_ratio)
+            if persistent:
+                self._persistent_cache[key] = b''.join((
+                    struct.pack('!III', width, height, len(image_data)),
+                    image_data, alpha_data or b''))
+
         if self.mode in ('RGB', 'RGBA'):
             color_space = '/DeviceRGB'
         elif self.mode in ('L', 'LA'):
@@ -160,7 +224,10 @@ class RasterImage:
             if self.invert_colors:
                 extra['Decode'] = pydyf.Array((1, 0) * 4)
             extra['Filter'] = '/DCTDecode'
-            return pydyf.Stream([self.image_data], extra)
+            if dpi_ratio == 1:
+                return pydyf.Stream([self.image_data], extra)
+            stream = self.cache_image_data(image_data, slot='thumbnail')
+            return pydyf.Stream([stream], extra)
 
         extra['Filter'] = '/FlateDecode'
         extra['DecodeParms'] = pydyf.Dictionary({
@@ -176,14 +243,8 @@ class RasterImage:
         if self.mode in ('RGB', 'RGBA'):
             # Defaults to 1.
             extra['DecodeParms']['Colors'] = 3
-        if self.mode in ('RGBA', 'LA'):
-            # Remove alpha channel from image
-            pillow_image = Image.open(io.BytesIO(self.image_data.data))
-            alpha = pillow_image.getchannel('A')
-            pillow_image = pillow_image.convert(self.mode[:-1])
-            png_data = self._get_png_data(pillow_image)
+        if alpha_data is not None:
             # Save alpha channel as mask
-            alpha_data = self._get_png_data(alpha)
             stream = self.cache_image_data(alpha_data, slot='streamalpha')
             extra['SMask'] = pydyf.Stream([stream], extra={
                 'Filter': '/FlateDecode',
@@ -199,11 +260,8 @@ class RasterImage:
                 'BitsPerComponent': 8,
                 'Interpolate': 'true' if interpolate else 'false',
             })
-        else:
-            png_data = self._get_png_data(
-                Image.open(io.BytesIO(self.image_data.data)))
 
-        return pydyf.Stream([self.cache_image_data(png_data, slot='stream')], extra)
+        return pydyf.Stream([self.cache_image_data(image_data, slot='stream')], extra)
 
     @staticmethod
     def _get_png_data(pillow_image):
@@ -258,6 +316,8 @@ class LazyLocalImage(pydyf.Object):
 
 class SVGImage:
     def __init__(self, tree, base_url, url_fetcher, context):
+        from .svg import SVG
+
         self._svg = SVG(tree, base_url)
         self._base_url = base_url
         self._url_fetcher = url_fetcher
@@ -321,6 +381,10 @@ def get_image_from_uri(cache, url_fetcher, options, url, forced_mime_type=None,
                 svg_exceptions.append(svg_exception)
         # Try pillow for raster images, or for failing SVG
         if image is None:
+            from PIL import Image, ImageFile
+
+            # Don’t crash when converting truncated images
+            ImageFile.LOAD_TRUNCATED_IMAGES = True
             try:
                 pillow_image = Image.open(BytesIO(string))
             except Exception as raster_exception:
@@ -350,12 +414,71 @@ def get_image_from_uri(cache, url_fetcher, options, url, forced_mime_type=None,
     return image
 
 
+def find_image_urls(style_for, base_url):
+    """Yield URLs of images used by displayed elements and pseudo-elements."""
+    for (element, pseudo_type), style in style_for.get_computed_styles().items():
+        if style['display'] == ('none',):
+            continue
+        if pseudo_type is None and element.tag in IMAGE_ATTRIBUTES:
+            attribute = IMAGE_ATTRIBUTES[element.tag]
+            if url := get_url_attribute(element, attribute, base_url):
+                yield url
+        for type_, value in style['background_image']:
+            if type_ == 'url':
+                yield value
+        for key in ('list_style_image', 'border_image_source', 'mask_border_source'):
+            type_, value = style[key]
+            if type_ == 'url':
+                yield value
+        if pseudo_type and style['content'] not in ('normal', 'none', 'inhibit'):
+            for type_, value in style['content']:
+                if type_ == 'url' and value[0] == 'external':
+                    yield value[1]
+
+
+def prefetch_images(urls, url_fetcher, workers):
+    """Fetch given URLs concurrently, return a URL fetcher using fetched data.
+
+    Each prefetched result is given once by the returned URL fetcher, other
+    URLs are fetched by ``url_fetcher``. Errors are ignored, they are reported
+    when the URLs are fetched again.
+
+    """
+    fetched = {}
+
+    def fetch_url(url):
+        try:
+            with fetch(url_fetcher, url) as result:
+                if 'file_obj' in result:
+                    string = result['file_obj'].read()
+                else:
+                    string = result['string']
+                fetched[url] = {
+                    key: value for key, value in result.items()
+                    if key != 'file_obj'}
+                fetched[url]['string'] = string
+        except Exception as exception:
+            LOGGER.debug('Failed to prefetch %r: %s', url, exception)
+
+    with ThreadPoolExecutor(workers) as executor:
+        tuple(executor.map(fetch_url, urls))
+
+    def prefetched_url_fetcher(url):
+        if url in fetched:
+            return fetched.pop(url)
+        return url_fetcher(url)
+
+    return prefetched_url_fetcher
+
+
 def rotate_pillow_image(pillow_image, orientation):
     """Return a copy of a Pillow image with modified orientation.
 
     If orientation is not changed, return the same image.
 
     """
+    from PIL import Image, ImageOps
+
     image_format = pillow_image.format
     if orientation == 'from-image':
         if 'exif' in pillow_image.info:
@@ -14,8 +14,9 @@ from collections import defaultdict
 from functools import partial
 from math import inf
 
+from ..css.utils import Pending
 from ..formatting_structure import boxes, build
-from ..logger import PROGRESS_LOGGER
+from ..logger import PROGRESS_LOGGER, measure
 from .absolute import absolute_box_layout, absolute_layout
 from .background import layout_backgrounds
 from .block import block_level_layout
@@ -99,21 +100,38 @@ def layout_fixed_boxes(context, pages, containing_page):
                 absolute_boxes = new_absolute_boxes
 
 
-def layout_document(html, root_box, context, max_loops=8):
-    """Lay out the whole document.
+def _uses_pages_counter(value):
+    """Whether the ``pages`` counter may be used by a property value."""
+    if isinstance(value, str):
+        return value == 'pages'
+    elif isinstance(value, (tuple, list)):
+        return any(_uses_pages_counter(item) for item in value)
+    # Values depending on variables are only known when computed.
+    return isinstance(value, Pending)
 
-    This includes line breaks, page breaks, absolute size and position for all
-    boxes. Page based counters might require multiple passes.
 
-    :param root_box:
-        Root of the box tree (formatting structure of the HTML). The page boxes
-        are created from that tree, this structure is not lost during
-        pagination.
-    :returns:
-        A list of laid out Page objects.
+def _can_layout_incrementally(context, root_box):
+    """Whether pages can be finished as soon as they are laid out.
+
+    Pages can be finished without laying out the following pages when they
+    don't depend on these following pages: no page-based counters or
+    ``target-*`` functions in content, no ``pages`` counter in margin boxes,
+    and no fixed boxes repeated on all pages.
 
     """
-    initialize_page_maker(context, root_box)
+    if context.target_collector.counter_lookup_items:
+        return False
+    for name, values, _ in context.style_for.get_page_declarations():
+        if name == 'content' and _uses_pages_counter(values):
+            return False
+    for box in root_box.descendants():
+        if box.style['position'] == 'fixed':
+            return False
+    return True
+
+
+def _paginate(html, root_box, context, max_loops):
+    """Lay out all pages, repaginating until page-based counters are stable."""
     pages = []
     original_footnotes = []
     actual_total_pages = 0
@@ -127,8 +145,9 @@ def layout_document(html, root_box, context, max_loops=8):
         initial_total_pages = actual_total_pages
         if loop == 0:
             original_footnotes = context.footnotes.copy()
-        pages = list(make_all_pages(context, root_box, html, pages))
-        actual_total_pages = len(pages)
+        with measure(context.metrics, 'layout.pagination', loop=loop) as counters:
+            pages = list(make_all_pages(context, root_box, html, pages))
+            counters['pages'] = actual_total_pages = len(pages)
 
         # Check whether another round is required
         reloop_content = False
@@ -147,72 +166,111 @@ def layout_document(html, root_box, context, max_loops=8):
         if not reloop_content and not reloop_pages:
             break
 
+    return pages
+
+
+def _gather_page_values(context, page, page_index, watch_elements):
+    """Calculate string-sets and bookmark-labels of a paginated page."""
+    # We need the updated page_counter_values
+    _, _, _, page_state, _ = context.page_maker[page_index + 1]
+    page_counter_values = page_state[1]
+
+    for child in page.descendants():
+        # Only one bookmark per original box
+        if child.bookmark_label:
+            if child.element_tag.endswith('::before'):
+                checklist = watch_elements['before']
+            elif child.element_tag.endswith('::after'):
+                checklist = watch_elements['after']
+            else:
+                checklist = watch_elements['element']
+            if child.element in checklist:
+                child.bookmark_label = ''
+            else:
+                checklist.append(child.element)
+
+        if child.missing_link:
+            for (box, css_token), item in (
+                    context.target_collector.counter_lookup_items.items()):
+                if child.missing_link == box and css_token != 'content':
+                    if (css_token == 'bookmark-label' and
+                            not child.bookmark_label):
+                        # don't refill it!
+                        continue
+                    item.parse_again(page_counter_values)
+                    # string_set is a pointer, but the bookmark_label is
+                    # just a string: copy it
+                    if css_token == 'bookmark-label':
+                        child.bookmark_label = box.bookmark_label
+        # Collect the string_sets in the LayoutContext
+        string_sets = child.string_set
+        if string_sets and string_sets != 'none':
+            for string_set in string_sets:
+                string_name, text = string_set
+                context.string_set[string_name][page_index + 1].append(text)
+
+
+def _finish_page(context, page, page_index, previous_pages, next_pages):
+    """Add fixed boxes, margin boxes and backgrounds to a paginated page."""
+    root_children = []
+    root, footnote_area = page.children
+    root_children.extend(layout_fixed_boxes(context, previous_pages, page))
+    root_children.extend(root.children)
+    root_children.extend(layout_fixed_boxes(context, next_pages, page))
+    root.children = root_children
+    context.current_page = page_index + 1  # page_number starts at 1
+
+    # page_maker's page_state is ready for the MarginBoxes
+    state = context.page_maker[context.current_page][3]
+    page.children = (root,)
+    if footnote_area.children:
+        page.children += (footnote_area,)
+    page.children += tuple(make_margin_boxes(context, page, state))
+    layout_backgrounds(page, context.get_image_from_uri)
+    return page
+
+
+def layout_document(html, root_box, context, max_loops=8):
+    """Lay out the whole document.
+
+    This includes line breaks, page breaks, absolute size and position for all
+    boxes. Page based counters might require multiple passes.
+
+    When pages don't depend on the following pages, each page is yielded as
+    soon as it is laid out.
+
+    :param root_box:
+        Root of the box tree (formatting structure of the HTML). The page boxes
+        are created from that tree, this structure is not lost during
+        pagination.
+    :returns:
+        A generator of laid out Page objects.
+
+    """
+    initialize_page_maker(context, root_box)
+
+    # Prevent repetition of bookmarks (see #1145).
+    watch_elements = {'element': [], 'before': [], 'after': []}
+
+    if _can_layout_incrementally(context, root_box):
+        pages = make_all_pages(context, root_box, html, [])
+        for i, page in enumerate(pages):
+            _gather_page_values(context, page, i, watch_elements)
+            yield _finish_page(context, page, i, (), ())
+        return
+
+    pages = _paginate(html, root_box, context, max_loops)
+
     # Calculate string-sets and bookmark-labels containing page based counters
     # when pagination is finished. No need to do that (maybe multiple times) in
     # make_page because they dont create boxes, only appear in MarginBoxes and
     # in the final PDF.
-    # Prevent repetition of bookmarks (see #1145).
-
-    watch_elements = []
-    watch_elements_before = []
-    watch_elements_after = []
     for i, page in enumerate(pages):
-        # We need the updated page_counter_values
-        _, _, _, page_state, _ = context.page_maker[i + 1]
-        page_counter_values = page_state[1]
-
-        for child in page.descendants():
-            # Only one bookmark per original box
-            if child.bookmark_label:
-                if child.element_tag.endswith('::before'):
-                    checklist = watch_elements_before
-                elif child.element_tag.endswith('::after'):
-                    checklist = watch_elements_after
-                else:
-                    checklist = watch_elements
-                if child.element in checklist:
-                    child.bookmark_label = ''
-                else:
-                    checklist.append(child.element)
-
-            if child.missing_link:
-                for (box, css_token), item in (
-                        context.target_collector.counter_lookup_items.items()):
-                    if child.missing_link == box and css_token != 'content':
-                        if (css_token == 'bookmark-label' and
-                                not child.bookmark_label):
-                            # don't refill it!
-                            continue
-                        item.parse_again(page_counter_values)
-                        # string_set is a pointer, but the bookmark_label is
-                        # just a string: copy it
-                        if css_token == 'bookmark-label':
-                            child.bookmark_label = box.bookmark_label
-            # Collect the string_sets in the LayoutContext
-            string_sets = child.string_set
-            if string_sets and string_sets != 'none':
-                for string_set in string_sets:
-                    string_name, text = string_set
-                    context.string_set[string_name][i+1].append(text)
+        _gather_page_values(context, page, i, watch_elements)
 
     # Add margin boxes
     for i, page in enumerate(pages):
-        root_children = []
-        root, footnote_area = page.children
-        root_children.extend(layout_fixed_boxes(context, pages[:i], page))
-        root_children.extend(root.children)
-        root_children.extend(layout_fixed_boxes(context, pages[i + 1:], page))
-        root.children = root_children
-        context.current_page = i + 1  # page_number starts at 1
-
-        # page_maker's page_state is ready for the MarginBoxes
-        state = context.page_maker[context.current_page][3]
-        page.children = (root,)
-        if footnote_area.children:
-            page.children += (footnote_area,)
-        page.children += tuple(make_margin_boxes(context, page, state))
-        layout_backgrounds(page, context.get_image_from_uri)
-        yield page
+        yield _finish_page(context, page, i, pages[:i], pages[i + 1:])
 
 
 class FakeList(list):
@@ -223,12 +281,13 @@ class FakeList(list):
 
 class LayoutContext:
     def __init__(self, style_for, get_image_from_uri, font_config,
-                 counter_style, target_collector):
+                 counter_style, target_collector, metrics=None):
         self.style_for = style_for
         self.get_image_from_uri = partial(get_image_from_uri, context=self)
         self.font_config = font_config
         self.counter_style = counter_style
         self.target_collector = target_collector
+        self.metrics = metrics
         self._excluded_shapes_lists = []
         self.footnotes = []
         self.page_footnotes = {}
@@ -247,8 +306,12 @@ class LayoutContext:
         # Cache
         self.strut_layouts = {}
         self.font_features = {}
+        self.font_metrics = {}
+        self.pango_contexts = {}
+        self.pango_layouts = {}
         self.tables = {}
-        self.dictionaries = {}
+        self.paragraphs = {}
+        self.text_metrics = {}
 
     def overflows_page(self, bottom_space, position_y):
         return self.overflows(self.page_bottom - bottom_space, position_y)
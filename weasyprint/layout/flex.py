@@ -817,6 +817,7 @@ def flex_layout(context, box, bottom_space, skip_stack, containing_block, page_i
                                     child.padding_left + child.padding_right)
                         # TODO: Don't set style width, find a way to avoid width
                         # re-calculation after 16.
+                        child.style = child.style.copy()
                         child.style[cross] = Dimension(line.cross_size - margins, 'px')
         position_cross += line.cross_size
 
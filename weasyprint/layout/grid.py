@@ -1183,6 +1183,7 @@ def grid_layout(context, box, bottom_space, skip_stack, containing_block,
         justify_self = set(child.style['justify_self'])
         if justify_self & {'auto'}:
             justify_self = justify_items
+        child.style = child.style.copy()
         if justify_self & {'normal', 'stretch'}:
             if child.style['width'] == 'auto':
                 child.style['width'] = Dimension(child_width, 'px')
@@ -6,7 +6,7 @@ from math import inf
 from ..css import computed_from_cascaded
 from ..css.computed_values import character_ratio, strut_layout
 from ..formatting_structure import boxes, build
-from ..text.line_break import can_break_text, create_layout, split_first_line
+from ..text.line_break import Paragraph, can_break_text, create_layout, split_first_line
 from .absolute import AbsolutePlaceholder, absolute_layout
 from .flex import flex_layout
 from .float import avoid_collisions, float_layout
@@ -151,7 +151,8 @@ def get_next_linebox(context, linebox, position_y, bottom_space, skip_stack,
     fixed_boxes.extend(line_fixed)
 
     for placeholder in line_placeholders:
-        if 'inline' in placeholder.style.specified['display']:
+        style = placeholder.style
+        if 'inline' in style.specified.get('display', style['display']):
             # Inline-level static position:
             placeholder.translate(0, position_y - placeholder.position_y)
         else:
@@ -866,6 +867,56 @@ def split_inline_box(context, box, position_x, max_x, bottom_space, skip_stack,
         float_widths)
 
 
+# Maximum number of paragraphs kept in layout contexts.
+PARAGRAPHS_CACHE_SIZE = 16
+
+
+def _paragraph_draft(context, box, text, skip, max_width):
+    """Get draft of the line starting at ``skip``, laid out with its paragraph.
+
+    Paragraphs are laid out when a second line of the same text box is split
+    with the same width. Lines are then taken from this layout until the width
+    or the style changes. Return :obj:`None` when lines have to be laid out
+    one by one.
+
+    """
+    style = box.style
+    font_size = style['font_size']
+    if (max_width <= 0 or max_width == inf or max_width >= 2 ** 21 or
+            style['white_space'] not in ('normal', 'pre-wrap', 'pre-line') or
+            style['word_spacing'] or style['letter_spacing'] != 'normal' or
+            (style['hyphens'] == 'auto' and style['lang']) or
+            any(character in box.text for character in '\n\t\xad')):
+        # Lines may be split differently from the paragraph layout.
+        return None
+
+    key = (box.text, id(style))
+    paragraph = context.paragraphs.pop(key, None)
+    draft = None
+    if (isinstance(paragraph, Paragraph) and paragraph.style is style and
+            paragraph.max_width == max_width):
+        # Get line from the paragraph, lay out the end of the text again if
+        # the previous line has not been split as in the paragraph.
+        draft = paragraph.draft(skip)
+        if draft is None and paragraph.rebuilds < 2:
+            paragraph = Paragraph(
+                box.text, skip, style, context, max_width, paragraph.rebuilds + 1)
+            draft = paragraph.draft(skip)
+    elif (isinstance(paragraph, tuple) and paragraph[0] is style and
+            paragraph[1] == max_width and len(text) * font_size > 8 * max_width):
+        # Many lines are left, lay out the end of the text only once.
+        paragraph = Paragraph(box.text, skip, style, context, max_width)
+        draft = paragraph.draft(skip)
+    else:
+        # Remember the width, for the next line.
+        paragraph = (style, max_width)
+
+    context.paragraphs[key] = paragraph
+    while len(context.paragraphs) > PARAGRAPHS_CACHE_SIZE:
+        context.paragraphs.pop(next(iter(context.paragraphs)))
+    return draft
+
+
 def split_text_box(context, box, available_width, skip, is_line_start=True):
     """Keep as much text as possible from a TextBox in a limited width.
 
@@ -883,9 +934,10 @@ def split_text_box(context, box, available_width, skip, is_line_start=True):
     text = box.text.encode()[skip:]
     if font_size == 0 or not text:
         return None, None, False
+    draft = _paragraph_draft(context, box, text, skip, available_width)
     layout, length, resume_index, width, height, baseline = split_first_line(
         text.decode(), box.style, context, available_width,
-        box.justification_spacing, is_line_start=is_line_start)
+        box.justification_spacing, is_line_start=is_line_start, draft=draft)
     assert resume_index != 0
 
     if length > 0:
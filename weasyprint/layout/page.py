@@ -6,7 +6,7 @@ from math import inf
 
 from ..css import computed_from_cascaded
 from ..formatting_structure import boxes, build
-from ..logger import PROGRESS_LOGGER
+from ..logger import PROGRESS_LOGGER, measure
 from .absolute import absolute_box_layout, absolute_layout
 from .block import block_container_layout, block_level_layout
 from .float import float_layout
@@ -963,7 +963,9 @@ def make_all_pages(context, root_box, html, pages):
             remake_state['pages_wanted'] = False
             remake_state['anchors'] = []
             remake_state['content_lookups'] = []
-            page, resume_at = remake_page(i, page_groups, context, root_box, html)
+            with measure(context.metrics, 'layout.page', page=i + 1):
+                page, resume_at = remake_page(
+                    i, page_groups, context, root_box, html)
             reported_footnotes = context.reported_footnotes
             yield page
         else:
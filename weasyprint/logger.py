@@ -11,10 +11,14 @@ Logging levels are used for specific purposes:
   unreachable local fonts and various non-fatal problems;
 - infos are used in ``PROCESS_LOGGER`` to advertise rendering steps.
 
+Machine-readable information about rendering steps is given to the
+``metrics`` callable option, using :func:`measure`.
+
 """
 
 import contextlib
 import logging
+from time import perf_counter
 
 LOGGER = logging.getLogger('weasyprint')
 if not LOGGER.handlers:  # pragma: no cover
@@ -56,3 +60,29 @@ def capture_logs(logger='weasyprint', level=None):
     finally:
         logger.handlers = previous_handlers
         logger.setLevel(previous_level)
+
+
+@contextlib.contextmanager
+def measure(metrics, stage, **counters):
+    """Return a context manager sending events of a rendering stage.
+
+    ``metrics`` is called with a ``start`` event when the stage begins, and with
+    an ``end`` event including the ``duration`` of the stage in seconds when it
+    ends. Events are dictionaries including the ``stage`` name and the given
+    ``counters``.
+
+    The context manager yields the counters dictionary, that can be updated
+    during the stage. Nothing is done when ``metrics`` is ``None``.
+
+    """
+    if metrics is None:
+        yield counters
+        return
+    metrics({'stage': stage, 'event': 'start', **counters})
+    start = perf_counter()
+    try:
+        yield counters
+    finally:
+        metrics({
+            'stage': stage, 'event': 'end', 'duration': perf_counter() - start,
+            **counters})
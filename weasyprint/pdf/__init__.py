@@ -1,5 +1,6 @@
 """PDF generation management."""
 
+from concurrent.futures import ThreadPoolExecutor
 from importlib.resources import files
 
 import pydyf
@@ -7,11 +8,12 @@ from tinycss2.color4 import D50, D65
 
 from .. import VERSION, Attachment
 from ..html import W3C_DATE_RE
-from ..logger import LOGGER, PROGRESS_LOGGER
+from ..logger import LOGGER, PROGRESS_LOGGER, measure
 from ..matrix import Matrix
 from . import debug, pdfa, pdfua
 from .fonts import build_fonts_dictionary
-from .stream import Stream
+from .stream import SerializedStream, Stream
+from .streaming import StreamingPDF
 
 from .anchors import (  # isort:skip
     add_annotations, add_forms, add_links, add_outlines, resolve_links,
@@ -85,6 +87,8 @@ def _use_references(pdf, resources, images):
         # Masks
         if 'SMask' in x_object.extra:
             pdf.add_object(x_object.extra['SMask'])
+            if isinstance(pdf, StreamingPDF):
+                pdf.flush(x_object.extra['SMask'])
             x_object.extra['SMask'] = x_object.extra['SMask'].reference
 
         # Resources
@@ -92,6 +96,9 @@ def _use_references(pdf, resources, images):
             x_object.extra['Resources'] = _reference_resources(
                 pdf, x_object.extra['Resources'], images, resources['Font'])
 
+        if isinstance(pdf, StreamingPDF):
+            pdf.flush(x_object)
+
     # Patterns
     for key, pattern in resources.get('Pattern', {}).items():
         pdf.add_object(pattern)
@@ -128,7 +135,11 @@ def generate_pdf(document, target, zoom, **options):
         if 'srgb' in properties:
             srgb = properties['srgb']
 
-    pdf = pydyf.PDF()
+    if options['streaming_pdf']:
+        pdf = StreamingPDF(
+            target, options['pdf_version'], bool(options['pdf_identifier']))
+    else:
+        pdf = pydyf.PDF()
     images = {}
     color_space = pydyf.Dictionary({
         'lab-d50': pydyf.Array(('/Lab', pydyf.Dictionary({
@@ -200,7 +211,10 @@ def generate_pdf(document, target, zoom, **options):
         add_forms(
             page.forms, matrix, pdf, pdf_page, resources, stream,
             document.font_config.font_map)
-        page.paint(stream, scale)
+        with measure(options['metrics'], 'pdf.page', page=page_number + 1):
+            page.paint(stream, scale)
+        if isinstance(pdf, StreamingPDF):
+            pdf.flush(stream)
 
         # Bleed
         bleed = {key: value * 0.75 for key, value in page.bleed.items()}
@@ -329,3 +343,20 @@ def generate_pdf(document, target, zoom, **options):
             pdf, metadata, document, page_streams, attachments, compress)
 
     return pdf
+
+
+def serialize_streams(pdf, workers):
+    """Serialize and compress the streams of ``pdf`` in parallel.
+
+    Streams are replaced by objects including their final data, that is then
+    used when the PDF is written. The generated PDF is the same as the one
+    generated without this function.
+
+    """
+    streams = [
+        (index, pdf_object) for index, pdf_object in enumerate(pdf.objects)
+        if isinstance(pdf_object, pydyf.Stream) and pdf_object.free != 'f']
+    with ThreadPoolExecutor(workers) as executor:
+        datas = executor.map(lambda item: item[1].data, streams)
+        for (index, stream), data in zip(streams, datas):
+            pdf.objects[index] = SerializedStream(stream, data)
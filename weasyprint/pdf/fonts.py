@@ -2,20 +2,23 @@
 
 import io
 import re
-from hashlib import md5
+from collections import OrderedDict
+from hashlib import md5, sha256
 from logging import WARNING
 from math import ceil
 
 import pydyf
-from fontTools import subset
-from fontTools.ttLib import TTFont, TTLibError, ttFont
-from fontTools.varLib.mutator import instantiateVariableFont
 
-from ..logger import LOGGER, capture_logs
+from ..logger import LOGGER, capture_logs, measure
 from ..text.constants import PANGO_STRETCH_PERCENT
 from ..text.ffi import FROM_UNITS, ffi, harfbuzz, harfbuzz_subset, pango
 from ..text.fonts import get_hb_object_data, get_pango_font_hb_face
 
+# Cleaned fonts shared between documents, as subsetting and instancing fonts
+# is slow, and as the same fonts with the same glyphs are often rendered again.
+CLEANED_FONTS_CACHE_SIZE = 32
+_cleaned_fonts = OrderedDict()
+
 
 class Font:
     def __init__(self, pango_font, description, font_size):
@@ -118,6 +121,9 @@ class Font:
 
         # Transform variable into static font.
         if 'fvar' in self.tables:
+            from fontTools.ttLib import TTFont
+            from fontTools.varLib.mutator import instantiateVariableFont
+
             full_font = io.BytesIO(self.file_content)
             ttfont = TTFont(full_font, fontNumber=self.index)
             if 'wght' not in self.variations:
@@ -151,6 +157,8 @@ class Font:
 
         # Remove images.
         if self.png or self.svg:
+            from fontTools.ttLib import TTFont, TTLibError, ttFont
+
             full_font = io.BytesIO(self.file_content)
             ttfont = TTFont(full_font, fontNumber=self.index)
             try:
@@ -174,6 +182,31 @@ class Font:
             except TTLibError:
                 LOGGER.warning('Unable to save emoji font')
 
+    def cached_clean(self, cmap, hinting, persistent_cache=None):
+        """Remove useless data from font, using cached results if possible.
+
+        Results are stored in memory, and in ``persistent_cache`` if given.
+
+        """
+        key = '-'.join((
+            'font', sha256(self.file_content).hexdigest(), str(self.index),
+            md5(repr((
+                sorted(cmap), bool(hinting), sorted(self.variations.items()),
+                self.weight, self.style, self.font_size,
+            )).encode(), usedforsecurity=False).hexdigest()))
+
+        if (file_content := _cleaned_fonts.pop(key, None)) is None:
+            if persistent_cache is not None:
+                file_content = persistent_cache.get(key)
+            if file_content is None:
+                self.clean(cmap, hinting)
+                file_content = self.file_content
+                if persistent_cache is not None:
+                    persistent_cache[key] = file_content
+        self.file_content = _cleaned_fonts[key] = file_content
+        while len(_cleaned_fonts) > CLEANED_FONTS_CACHE_SIZE:
+            _cleaned_fonts.popitem(last=False)
+
     @property
     def type(self):
         return 'otf' if self.file_content[:4] == b'OTTO' else 'ttf'
@@ -251,6 +284,10 @@ class Font:
 
     def _fonttools_subset(self, cmap, hinting):
         """Subset font using Fonttools."""
+        # Only imported when needed, as importing the subsetter is slow.
+        from fontTools import subset
+        from fontTools.ttLib import TTFont, TTLibError
+
         full_font = io.BytesIO(self.file_content)
 
         # Set subset options.
@@ -296,7 +333,11 @@ def build_fonts_dictionary(pdf, fonts, compress, subset, options):
         if subset and not font.used_in_forms:
             for file_font in file_fonts:
                 cmap = {**cmap, **file_font.cmap}
-        font.clean(cmap, options['hinting'])
+        with measure(
+                options['metrics'], 'pdf.font', family=font.family.decode(),
+                glyphs=len(cmap)):
+            font.cached_clean(
+                cmap, options['hinting'], options['persistent_cache'])
 
         # Include font.
         if font.type == 'otf':
@@ -314,6 +355,8 @@ def build_fonts_dictionary(pdf, fonts, compress, subset, options):
             cmap = font.cmap
         else:
             # Store width and Unicode map for all glyphs
+            from fontTools.ttLib import TTFont
+
             full_font = io.BytesIO(font.file_content)
             ttfont = TTFont(full_font, fontNumber=font.index)
             font_widths, cmap = {}, {}
@@ -377,6 +420,8 @@ def build_fonts_dictionary(pdf, fonts, compress, subset, options):
 
 def _build_bitmap_font_dictionary(font_dictionary, pdf, font, widths, compress, subset):
     # https://docs.microsoft.com/typography/opentype/spec/ebdt
+    from fontTools.ttLib import TTFont
+
     font_dictionary['FontBBox'] = pydyf.Array([0, 0, 1, 1])
     font_dictionary['FontMatrix'] = pydyf.Array([1, 0, 0, 1, 0, 0])
     if subset:
@@ -9,6 +9,24 @@ from ..text.fonts import get_pango_font_key
 from .fonts import Font
 
 
+class SerializedStream(pydyf.Object):
+    """PDF stream object whose data has already been serialized."""
+    def __init__(self, stream, data):
+        super().__init__()
+        self.number = stream.number
+        self.generation = stream.generation
+        self.free = stream.free
+        self._data = data
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def compressible(self):
+        return False
+
+
 class Stream(pydyf.Stream):
     """PDF stream object with extra features."""
     def __init__(self, fonts, page_rectangle, resources, images, mark, *args, **kwargs):
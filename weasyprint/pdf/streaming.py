@@ -0,0 +1,170 @@
+"""PDF document written while it is generated."""
+
+from hashlib import md5
+from math import ceil, log
+
+import pydyf
+
+
+class WrittenObject(pydyf.Object):
+    """PDF object already written in the output."""
+    def __init__(self, pdf_object):
+        super().__init__()
+        self.number = pdf_object.number
+        self.offset = pdf_object.offset
+        self.generation = pdf_object.generation
+
+    @property
+    def data(self):
+        raise ValueError('Data of written objects is not available anymore')
+
+    @property
+    def compressible(self):
+        return False
+
+
+class StreamingPDF(pydyf.PDF):
+    """PDF document writing its streams as soon as they are complete.
+
+    The header is written when the document is created, streams are written
+    by :meth:`flush`, and other objects are written by :meth:`write` at the
+    end of the generation.
+
+    """
+    def __init__(self, output, version=None, identifier=False):
+        super().__init__()
+        self.output = output
+        self.version = str(version or '1.7').encode()
+        self._hash = md5(usedforsecurity=False) if identifier else None
+        self.write_line(b'%PDF-' + self.version, output)
+        self.write_line(b'%\xf0\x9f\x96\xa4', output)
+
+    def _write_object(self, pdf_object):
+        pdf_object.offset = self.current_position
+        if self._hash is not None:
+            self._hash.update(pdf_object.data)
+        self.write_line(pdf_object.indirect, self.output)
+
+    def flush(self, stream):
+        """Write ``stream`` in the output and release its content."""
+        self._write_object(stream)
+        self.objects[stream.number] = WrittenObject(stream)
+        stream.stream = []
+
+    def write(self, output=None, version=None, identifier=False, compress=False):
+        """Write remaining objects, cross-reference table and trailer.
+
+        ``output`` and ``version`` are ignored, as they are given when the
+        document is created. ``identifier`` is only used if given as bytes,
+        automatic identifiers are activated when the document is created.
+
+        """
+        output = self.output
+        if self.info:
+            self.add_object(self.info)
+
+        pending_objects = [
+            pdf_object for pdf_object in self.objects
+            if pdf_object.free != 'f' and not isinstance(pdf_object, WrittenObject)]
+
+        if self.version >= b'1.5' and compress:
+            # Write objects that can't be compressed, store other ones in an
+            # object stream.
+            compressed_objects = []
+            for pdf_object in pending_objects:
+                if pdf_object.compressible:
+                    compressed_objects.append(pdf_object)
+                else:
+                    self._write_object(pdf_object)
+            stream = [[]]
+            position = 0
+            for pdf_object in compressed_objects:
+                data = pdf_object.data
+                stream.append(data)
+                stream[0].append(pdf_object.number)
+                stream[0].append(position)
+                position += len(data) + 1
+            stream[0] = ' '.join(str(i) for i in stream[0])
+            extra = {
+                'Type': '/ObjStm',
+                'N': len(compressed_objects),
+                'First': len(stream[0]) + 1,
+            }
+            object_stream = pydyf.Stream(stream, extra, compress)
+            self.add_object(object_stream)
+            self._write_object(object_stream)
+
+            # Write cross-reference stream.
+            xref = []
+            dict_index = 0
+            for pdf_object in self.objects:
+                if pdf_object.compressible:
+                    xref.append((2, object_stream.number, dict_index))
+                    dict_index += 1
+                else:
+                    xref.append((
+                        bool(pdf_object.number), pdf_object.offset,
+                        pdf_object.generation))
+            xref.append((1, self.current_position, 0))
+            field2_size = ceil(log(self.current_position + 1, 256))
+            max_generation = max(
+                pdf_object.generation for pdf_object in self.objects)
+            field3_size = ceil(log(
+                max(max_generation, len(compressed_objects)) + 1, 256))
+            xref_lengths = (1, field2_size, field3_size)
+            xref_stream = b''.join(
+                value.to_bytes(length, 'big')
+                for line in xref for length, value in zip(xref_lengths, line))
+            extra = {
+                'Type': '/XRef',
+                'Index': pydyf.Array((0, len(self.objects) + 1)),
+                'W': pydyf.Array(xref_lengths),
+                'Size': len(self.objects) + 1,
+                'Root': self.catalog.reference,
+            }
+            if self.info:
+                extra['Info'] = self.info.reference
+            if self._hash is not None:
+                extra['ID'] = pydyf.Array(self._identifiers(identifier))
+            xref_object = pydyf.Stream([xref_stream], extra, compress)
+            self.xref_position = self.current_position
+            self.add_object(xref_object)
+            xref_object.offset = self.current_position
+            self.write_line(xref_object.indirect, output)
+        else:
+            for pdf_object in pending_objects:
+                self._write_object(pdf_object)
+
+            # Write cross-reference table.
+            self.xref_position = self.current_position
+            self.write_line(b'xref', output)
+            self.write_line(f'0 {len(self.objects)}'.encode(), output)
+            for pdf_object in self.objects:
+                self.write_line((
+                    f'{pdf_object.offset:010} {pdf_object.generation:05} '
+                    f'{pdf_object.free} ').encode(), output)
+
+            # Write trailer.
+            self.write_line(b'trailer', output)
+            self.write_line(b'<<', output)
+            self.write_line(f'/Size {len(self.objects)}'.encode(), output)
+            self.write_line(b'/Root ' + self.catalog.reference, output)
+            if self.info:
+                self.write_line(b'/Info ' + self.info.reference, output)
+            if self._hash is not None:
+                identifier, data_hash = self._identifiers(identifier)
+                self.write_line(
+                    b'/ID [' + identifier + b' ' + data_hash + b']', output)
+            self.write_line(b'>>', output)
+
+        self.write_line(b'startxref', output)
+        self.write_line(f'{self.xref_position}'.encode(), output)
+        self.write_line(b'%%EOF', output)
+
+    def _identifiers(self, identifier):
+        data_hash = self._hash.hexdigest().encode()
+        if identifier in (False, True, None):
+            identifier = data_hash
+        elif isinstance(identifier, str):
+            identifier = identifier.encode()
+        return pydyf.String(identifier).data, pydyf.String(data_hash).data
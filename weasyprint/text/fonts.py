@@ -8,8 +8,6 @@ from tempfile import mkdtemp
 from warnings import warn
 from xml.etree.ElementTree import Element, SubElement, tostring
 
-from fontTools.ttLib import TTFont, woff2
-
 from ..logger import LOGGER
 from ..urls import FILESYSTEM_ENCODING, fetch
 
@@ -105,6 +103,37 @@ class FontConfiguration:
         # Temporary folder storing fonts.
         self._folder = None
 
+        # Fonts added by @font-face rules, with their Fontconfig XML config.
+        self._fonts = []
+        self._base = None
+
+    def copy(self):
+        """Create a new font configuration including the fonts of this one.
+
+        Fonts added to the copy by ``@font-face`` rules are not added to this
+        font configuration.
+
+        """
+        font_config = FontConfiguration()
+        # Keep this configuration alive, fonts are stored in its folder.
+        font_config._base = self
+        for xml, font_path in self._fonts:
+            font_config._register_font(xml, font_path)
+        return font_config
+
+    def _register_font(self, xml, font_path):
+        """Register font and configuration in Fontconfig."""
+        # TODO: We should mask local fonts with the same name
+        # too as explained in Behdad's blog entry.
+        fontconfig.FcConfigParseAndLoadFromMemory(self._config, xml, True)
+        font_added = fontconfig.FcConfigAppFontAddFile(
+            self._config, str(font_path).encode(FILESYSTEM_ENCODING))
+        if font_added:
+            self._fonts.append((xml, font_path))
+            pangoft2.pango_fc_font_map_config_changed(
+                ffi.cast('PangoFcFontMap *', self.font_map))
+        return font_added
+
     def add_font_face(self, rule_descriptors, url_fetcher):
         """Add a font face to the Fontconfig configuration."""
 
@@ -171,6 +200,8 @@ class FontConfiguration:
             try:
                 # Decode woff and woff2 fonts.
                 if font[:3] == b'wOF':
+                    from fontTools.ttLib import TTFont, woff2
+
                     out = BytesIO()
                     woff_version_byte = font[3:4]
                     if woff_version_byte == b'F':  # woff font
@@ -230,15 +261,8 @@ class FontConfiguration:
                 b'<!DOCTYPE fontconfig SYSTEM "urn:fontconfig:fonts.dtd">')
             xml = b'\n'.join((*header, tostring(root, encoding='utf-8')))
 
-            # Register font and configuration in Fontconfig.
-            # TODO: We should mask local fonts with the same name
-            # too as explained in Behdad's blog entry.
-            fontconfig.FcConfigParseAndLoadFromMemory(self._config, xml, True)
-            font_added = fontconfig.FcConfigAppFontAddFile(
-                self._config, str(font_path).encode(FILESYSTEM_ENCODING))
-            if font_added:
-                return pangoft2.pango_fc_font_map_config_changed(
-                    ffi.cast('PangoFcFontMap *', self.font_map))
+            if self._register_font(xml, font_path):
+                return
             LOGGER.debug('Failed to load font at %r', url)
         LOGGER.warning('Font-face %r cannot be loaded', rule_descriptors['font_family'])
 
@@ -1,6 +1,9 @@
 """Decide where to break text lines."""
 
 import re
+import threading
+from copy import copy
+from functools import lru_cache
 from math import inf
 
 import pyphen
@@ -54,6 +57,29 @@ def first_line_metrics(first_line, text, layout, resume_at, space_collapse,
     return layout, length, resume_at, width, height, baseline
 
 
+# Font map and Pango contexts of layouts without layout context, created once
+# for each thread as Pango objects can't be shared by threads.
+_measurement = threading.local()
+
+
+def _get_measurement_font_map():
+    """Get font map and Pango contexts of layouts without layout context.
+
+    These layouts only use system fonts, creating a font map for each of them
+    would enumerate the installed fonts each time.
+
+    """
+    if not hasattr(_measurement, 'font_map'):
+        _measurement.font_map = ffi.gc(
+            pangoft2.pango_ft2_font_map_new(), gobject.g_object_unref)
+        _measurement.pango_contexts = {}
+    return _measurement.font_map, _measurement.pango_contexts
+
+
+# Maximum number of unused Pango layouts kept for each Pango context.
+PANGO_LAYOUTS_POOL_SIZE = 16
+
+
 class Layout:
     """Object holding PangoLayout-related cdata pointers."""
     def __init__(self, context, style, justification_spacing=0,
@@ -67,56 +93,61 @@ class Layout:
         self.style = style
         self.first_line_direction = 0
 
-        if context is None:
-            font_map = ffi.gc(
-                pangoft2.pango_ft2_font_map_new(), gobject.g_object_unref)
-        else:
-            font_map = context.font_config.font_map
-        pango_context = ffi.gc(
-            pango.pango_font_map_create_context(font_map),
-            gobject.g_object_unref)
-        pango.pango_context_set_round_glyph_positions(pango_context, False)
-        pango.pango_context_set_base_dir(
-            pango_context, PANGO_DIRECTION[style['direction']])
-
         if style['font_language_override'] != 'normal':
-            lang_p, lang = unicode_to_char_p(LST_TO_ISO.get(
+            lang = LST_TO_ISO.get(
                 style['font_language_override'].lower(),
-                style['font_language_override']))
+                style['font_language_override'])
         elif style['lang']:
-            lang_p, lang = unicode_to_char_p(style['lang'])
+            lang = style['lang']
         else:
             lang = None
-            self.language = pango.pango_language_get_default()
         if lang:
+            lang_p, _ = unicode_to_char_p(lang)
             self.language = pango.pango_language_from_string(lang_p)
-            pango.pango_context_set_language(pango_context, self.language)
+        else:
+            self.language = pango.pango_language_get_default()
+
+        # Pango contexts only depend on the direction and on the language,
+        # they are shared by the layouts of a layout context. Unused layouts
+        # of these contexts are kept in pools, and reset before being reused.
+        self._pool_key = (style['direction'], lang)
+        if context is None:
+            font_map, pango_contexts = _get_measurement_font_map()
+            pool = None
+        else:
+            font_map = context.font_config.font_map
+            pango_contexts = context.pango_contexts
+            pool = context.pango_layouts.get(self._pool_key)
+        pango_context = pango_contexts.get(self._pool_key)
+        if pango_context is None:
+            pango_context = self._create_pango_context(
+                font_map, style['direction'], lang and self.language)
+            pango_contexts[self._pool_key] = pango_context
 
         assert not isinstance(style['font_family'], str), (
             'font_family should be a list')
         font_description = get_font_description(style)
-        self.layout = ffi.gc(
-            pango.pango_layout_new(pango_context),
-            gobject.g_object_unref)
-        pango.pango_layout_set_auto_dir(self.layout, False)
+        if pool:
+            self.layout = pool.pop()
+            pango.pango_layout_set_attributes(self.layout, ffi.NULL)
+            pango.pango_layout_set_tabs(self.layout, ffi.NULL)
+            pango.pango_layout_set_width(self.layout, -1)
+            pango.pango_layout_set_wrap(self.layout, PANGO_WRAP_MODE['WRAP_WORD'])
+            pango.pango_layout_set_ellipsize(
+                self.layout, pango.PANGO_ELLIPSIZE_NONE)
+            pango.pango_layout_set_single_paragraph_mode(self.layout, False)
+        else:
+            self.layout = ffi.gc(
+                pango.pango_layout_new(pango_context),
+                gobject.g_object_unref)
+            pango.pango_layout_set_auto_dir(self.layout, False)
         pango.pango_layout_set_font_description(self.layout, font_description)
 
         text_decoration = style['text_decoration_line']
         if text_decoration != 'none':
-            metrics = ffi.gc(
-                pango.pango_context_get_metrics(
-                    pango_context, font_description, self.language),
-                pango.pango_font_metrics_unref)
-            self.ascent = FROM_UNITS * (
-                pango.pango_font_metrics_get_ascent(metrics))
-            self.underline_position = FROM_UNITS * (
-                pango.pango_font_metrics_get_underline_position(metrics))
-            self.strikethrough_position = FROM_UNITS * (
-                pango.pango_font_metrics_get_strikethrough_position(metrics))
-            self.underline_thickness = FROM_UNITS * (
-                pango.pango_font_metrics_get_underline_thickness(metrics))
-            self.strikethrough_thickness = FROM_UNITS * (
-                pango.pango_font_metrics_get_strikethrough_thickness(metrics))
+            (self.ascent, self.underline_position, self.strikethrough_position,
+             self.underline_thickness, self.strikethrough_thickness) = (
+                 self._get_font_metrics(pango_context, font_description))
         else:
             self.ascent = None
             self.underline_position = None
@@ -131,12 +162,48 @@ class Layout:
             features = ','.join(
                 f'{key} {value}' for key, value in features.items()).encode()
             # In the meantime, keep a cache to avoid leaking too many of them.
-            attr = context.font_features.setdefault(
-                features, pango.pango_attr_font_features_new(features))
+            if features not in context.font_features:
+                context.font_features[features] = (
+                    pango.pango_attr_font_features_new(features))
+            attr = context.font_features[features]
             attr_list = pango.pango_attr_list_new()
             pango.pango_attr_list_insert(attr_list, attr)
             pango.pango_layout_set_attributes(self.layout, attr_list)
 
+    @staticmethod
+    def _create_pango_context(font_map, direction, language=None):
+        pango_context = ffi.gc(
+            pango.pango_font_map_create_context(font_map),
+            gobject.g_object_unref)
+        pango.pango_context_set_round_glyph_positions(pango_context, False)
+        pango.pango_context_set_base_dir(pango_context, PANGO_DIRECTION[direction])
+        if language:
+            pango.pango_context_set_language(pango_context, language)
+        return pango_context
+
+    def _get_font_metrics(self, pango_context, font_description):
+        """Get metrics used to draw text decorations."""
+        from ..css.computed_values import _font_style_cache_key
+
+        if self.context is not None:
+            key = _font_style_cache_key(self.style, include_size=True)
+            if key in self.context.font_metrics:
+                return self.context.font_metrics[key]
+
+        metrics = ffi.gc(
+            pango.pango_context_get_metrics(
+                pango_context, font_description, self.language),
+            pango.pango_font_metrics_unref)
+        result = tuple(FROM_UNITS * value for value in (
+            pango.pango_font_metrics_get_ascent(metrics),
+            pango.pango_font_metrics_get_underline_position(metrics),
+            pango.pango_font_metrics_get_strikethrough_position(metrics),
+            pango.pango_font_metrics_get_underline_thickness(metrics),
+            pango.pango_font_metrics_get_strikethrough_thickness(metrics)))
+        if self.context is not None:
+            self.context.font_metrics[key] = result
+        return result
+
     def get_first_line(self):
         first_line = pango.pango_layout_get_line_readonly(self.layout, 0)
         second_line = pango.pango_layout_get_line_readonly(self.layout, 1)
@@ -225,6 +292,11 @@ class Layout:
         pango.pango_layout_set_tabs(self.layout, array)
 
     def deactivate(self):
+        if self.context is not None:
+            # Give the Pango layout back to the pool of its Pango context.
+            pool = self.context.pango_layouts.setdefault(self._pool_key, [])
+            if len(pool) < PANGO_LAYOUTS_POOL_SIZE:
+                pool.append(self.layout)
         del self.layout, self.language, self.style
 
     def reactivate(self, style):
@@ -246,8 +318,86 @@ def create_layout(text, style, context, max_width, justification_spacing):
     return layout
 
 
+class Paragraph:
+    """Text laid out once for all its lines, for a given style and width.
+
+    Lines starting at the beginning of lines of this layout are given as
+    drafts to :func:`split_first_line`, instead of laying out the text of each
+    line again.
+
+    """
+    def __init__(self, text, start, style, context, max_width, rebuilds=0):
+        self.style = style
+        self.max_width = max_width
+        self.start = start
+        self.rebuilds = rebuilds
+        self._bytestring = text.encode()[start:]
+        self._layout = create_layout(
+            self._bytestring.decode(), style, context, max_width, 0)
+        self._log_attrs = pango.pango_layout_get_log_attrs_readonly(
+            self._layout.layout, ffi.NULL)
+        self._line_index = 0
+
+    def _get_line(self, index):
+        line = pango.pango_layout_get_line_readonly(self._layout.layout, index)
+        return None if line == ffi.NULL else line
+
+    def draft(self, skip):
+        """Get draft of the line starting at ``skip`` UTF-8 bytes.
+
+        Return ``(first_line, resume_index, log_attrs, length)``, or
+        :obj:`None` if no line of the paragraph starts at ``skip``.
+        ``log_attrs`` are the Pango logical attributes of the text starting at
+        ``skip``, and ``length`` is the number of characters of the two first
+        lines of this text.
+
+        """
+        offset = skip - self.start
+        if offset < 0:
+            return None
+        line = self._get_line(self._line_index)
+        if line is None or line.start_index > offset:
+            self._line_index = 0
+            line = self._get_line(0)
+        while line is not None and line.start_index < offset:
+            self._line_index += 1
+            line = self._get_line(self._line_index)
+        if line is None or line.start_index != offset:
+            return None
+
+        second_line = self._get_line(self._line_index + 1)
+        if second_line is None:
+            resume_index = None
+            end = len(self._bytestring)
+        else:
+            resume_index = second_line.start_index - offset
+            end = second_line.start_index + second_line.length
+        start = len(self._bytestring[:offset].decode())
+        length = len(self._bytestring[offset:end].decode())
+        return line, resume_index, self._log_attrs + start, length
+
+
+# Maximum number of hyphenated words stored for all documents.
+HYPHENATION_CACHE_SIZE = 8192
+
+# Maximum number of text metrics stored in layout contexts.
+TEXT_METRICS_CACHE_SIZE = 4096
+
+
+def _text_metrics_key(text, style):
+    """Get key identifying text and style properties used to lay it out."""
+    from ..css.computed_values import _font_style_cache_key
+
+    return (
+        text, _font_style_cache_key(style, include_size=True),
+        style['letter_spacing'], style['word_spacing'], style['white_space'],
+        style['font_kerning'], style['direction'], style['overflow_wrap'],
+        style['word_break'], style['hyphens'], style['tab_size'],
+        style['text_decoration_line'] != 'none')
+
+
 def split_first_line(text, style, context, max_width, justification_spacing,
-                     is_line_start=True, minimum=False):
+                     is_line_start=True, minimum=False, draft=None):
     """Fit as much as possible in the available width for one line of text.
 
     Return ``(layout, length, resume_index, width, height, baseline)``.
@@ -262,6 +412,52 @@ def split_first_line(text, style, context, max_width, justification_spacing,
     ``height``: height in pixels of the first line
     ``baseline``: baseline in pixels of the first line
 
+    ``draft`` is an optional value returned by :meth:`Paragraph.draft`, used
+    instead of laying out the beginning of the text to find the first line.
+
+    Metrics of text fitting in one line are cached in the layout context, and
+    reused for the same text and style when the available width is large
+    enough. Layouts are then copied, Pango layouts are created again only when
+    text is drawn.
+
+    """
+    if context is None or draft is not None:
+        return _split_first_line(
+            text, style, context, max_width, justification_spacing,
+            is_line_start, minimum, draft)
+
+    text_wrap = style['white_space'] in ('normal', 'pre-wrap', 'pre-line')
+    key = _text_metrics_key(text, style)
+    cache = context.text_metrics
+    if (metrics := cache.pop(key, None)) is not None:
+        # Keep recently used metrics at the end of the cache.
+        cache[key] = metrics
+        layout, length, resume_index, width, height, baseline = metrics
+        if max_width is None or not text_wrap or width <= max_width:
+            layout = copy(layout)
+            layout.justification_spacing = justification_spacing
+            layout.max_width = max_width
+            return layout, length, resume_index, width, height, baseline
+
+    metrics = _split_first_line(
+        text, style, context, max_width, justification_spacing,
+        is_line_start, minimum)
+    layout, length, resume_index, width, height, baseline = metrics
+    fits = max_width is None or not text_wrap or width <= max_width
+    if resume_index is None and fits:
+        # Store a copy, as layouts are modified by justification and drawing.
+        cache[key] = (copy(layout), *metrics[1:])
+        while len(cache) > TEXT_METRICS_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+    return metrics
+
+
+def _split_first_line(text, style, context, max_width, justification_spacing,
+                      is_line_start=True, minimum=False, draft=None):
+    """Fit as much as possible in the available width for one line of text.
+
+    See :func:`split_first_line`.
+
     """
     # See https://www.w3.org/TR/css-text-3/#white-space-property
     text_wrap = style['white_space'] in ('normal', 'pre-wrap', 'pre-line')
@@ -274,7 +470,15 @@ def split_first_line(text, style, context, max_width, justification_spacing,
     # Step #1: Get a draft layout with the first line.
     ratio = 4  # number that almost always respects char_height / char_width > ratio
     short_text = text
-    if max_width is not None and max_width != inf and style['font_size']:
+    log_attrs = None
+    if draft is not None and max_width is not None:
+        # The first line has been found in the layout of the whole paragraph.
+        # Keep an empty layout, its text is set when the line is known.
+        first_line, resume_index, log_attrs, length = draft
+        short_text = text[:length]
+        layout = create_layout(
+            '', style, context, max_width, justification_spacing)
+    elif max_width is not None and max_width != inf and style['font_size']:
         # Try to use a small amount of text to avoid the whole layout. We need
         # at least one line, and one possible line break point on the second line.
         if style['font_size'] * ratio > max_width:
@@ -316,8 +520,22 @@ def split_first_line(text, style, context, max_width, justification_spacing,
         return first_line_metrics(
             first_line, text, layout, resume_index, space_collapse, style)
     first_line_width, _ = line_size(first_line, style)
+    if draft is not None and first_line_width > max_width:
+        # The line of the paragraph overflows, its text has to be found and
+        # set in the layout by the following steps, don't use the draft.
+        return _split_first_line(
+            text, style, context, max_width, justification_spacing,
+            is_line_start, minimum)
     if resume_index is None and first_line_width <= max_width:
         # The first line fits in the available width.
+        if draft is not None:
+            layout.set_text(text)
+            first_line, resume_index = layout.get_first_line()
+            if resume_index is not None:
+                # The line laid out alone doesn't fit, don't trust the draft.
+                return _split_first_line(
+                    text, style, context, max_width, justification_spacing,
+                    is_line_start, minimum)
         return first_line_metrics(
             first_line, text, layout, resume_index, space_collapse, style)
 
@@ -338,7 +556,9 @@ def split_first_line(text, style, context, max_width, justification_spacing,
         break_point = None
     else:
         # Find then second line’s first break point.
-        log_attrs = pango.pango_layout_get_log_attrs_readonly(layout.layout, ffi.NULL)
+        if log_attrs is None:
+            log_attrs = pango.pango_layout_get_log_attrs_readonly(
+                layout.layout, ffi.NULL)
         start, end = len(first_line_text) + 1, len(short_text)
         second_line_log_attrs = log_attrs[start:end]
         break_point = get_next_break_point(second_line_log_attrs)
@@ -415,13 +635,8 @@ def split_first_line(text, style, context, max_width, justification_spacing,
         dictionary_iterations = [second_line_text[:i+1] for i in soft_hyphen_indexes]
         start_word = 0
     elif auto_hyphenation:
-        dictionary_key = (lang, left, right, total)
-        dictionary = context.dictionaries.get(dictionary_key)
-        if dictionary is None:
-            dictionary = pyphen.Pyphen(lang=lang, left=left, right=right)
-            context.dictionaries[dictionary_key] = dictionary
-        dictionary_iterations = [
-            start for start, end in dictionary.iterate(next_word)]
+        dictionary_iterations = list(
+            get_hyphenated_starts(lang, next_word, left, right))
     else:
         dictionary_iterations = []
 
@@ -501,6 +716,23 @@ def split_first_line(text, style, context, max_width, justification_spacing,
         hyphenated, style['hyphenate_character'])
 
 
+@lru_cache()
+def _get_dictionary(lang, left, right):
+    """Get Pyphen dictionary for language and hyphenation limits."""
+    return pyphen.Pyphen(lang=lang, left=left, right=right)
+
+
+@lru_cache(maxsize=HYPHENATION_CACHE_SIZE)
+def get_hyphenated_starts(lang, word, left, right):
+    """Get the starts of hyphenated word, the longest first.
+
+    Dictionaries and hyphenated words are shared by documents.
+
+    """
+    dictionary = _get_dictionary(lang, left, right)
+    return tuple(start for start, _ in dictionary.iterate(word))
+
+
 def get_log_attrs(text, lang):
     if lang:
         lang_p, lang = unicode_to_char_p(lang)
@@ -2,15 +2,22 @@
 
 import codecs
 import contextlib
+import gzip
 import os.path
 import re
 import sys
+import threading
+import time
 import traceback
 import zlib
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
 from gzip import GzipFile
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
 from pathlib import Path
+from urllib.error import HTTPError
 from urllib.parse import quote, unquote, urljoin, urlsplit
-from urllib.request import Request, pathname2url, urlopen
+from urllib.request import Request, getproxies, pathname2url, urlopen
 
 from . import __version__
 from .logger import LOGGER
@@ -247,6 +254,202 @@ def default_url_fetcher(url, timeout=10, ssl_context=None):
         raise ValueError('Not an absolute URI: %r' % url)
 
 
+class PooledURLFetcher:
+    """URL fetcher keeping HTTP connections alive and caching responses.
+
+    Instances can be given as the ``url_fetcher`` argument of :class:`HTML`
+    and :class:`CSS`, and shared between documents and threads.
+
+    HTTP and HTTPS connections are kept open and reused for following
+    requests to the same host. Responses are stored in a bounded cache and
+    reused according to their ``Cache-Control`` and ``Expires`` headers, or
+    revalidated using their ``ETag`` and ``Last-Modified`` headers.
+
+    Other URLs, and HTTP URLs when a proxy is configured, are fetched by
+    :func:`default_url_fetcher`.
+
+    :param int timeout:
+        The number of seconds before HTTP requests are dropped.
+    :param ssl.SSLContext ssl_context:
+        An SSL context used for HTTP requests.
+    :param int cache_size:
+        The maximum size in bytes of cached responses.
+    :param int connections:
+        The maximum number of idle connections kept open for each host.
+
+    """
+    max_redirections = 10
+
+    def __init__(self, timeout=10, ssl_context=None, cache_size=64 * 1024 * 1024,
+                 connections=8):
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.cache_size = cache_size
+        self.connections = connections
+        self._lock = threading.Lock()
+        # keys: (scheme, host, port), values: lists of idle connections
+        self._pool = {}
+        # keys: URLs, values: _CachedResponse objects
+        self._cache = OrderedDict()
+        self._cached_size = 0
+
+    def __call__(self, url):
+        scheme = urlsplit(url).scheme.lower()
+        if scheme not in ('http', 'https') or scheme in getproxies():
+            return default_url_fetcher(url, self.timeout, self.ssl_context)
+        url = iri_to_uri(url)
+        for _ in range(self.max_redirections):
+            result = self._fetch(url)
+            if 'location' not in result:
+                return result
+            url = iri_to_uri(urljoin(url, result['location']))
+        raise ValueError(f'Too many redirections for {url}')
+
+    def close(self):
+        """Close idle connections and clear cached responses."""
+        with self._lock:
+            for connections in self._pool.values():
+                for connection in connections:
+                    connection.close()
+            self._pool.clear()
+            self._cache.clear()
+            self._cached_size = 0
+
+    def _fetch(self, url):
+        with self._lock:
+            if cached := self._cache.get(url):
+                self._cache.move_to_end(url)
+        headers = HTTP_HEADERS.copy()
+        if cached:
+            if time.monotonic() < cached.expires:
+                return cached.result()
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+
+        status, reason, message, data = self._request(url, headers)
+        if status == 304 and cached:
+            cached.expires = _expires(message) or cached.expires
+            return cached.result()
+        if status in (301, 302, 303, 307, 308) and message['Location']:
+            return {'location': message['Location']}
+        if status >= 400:
+            raise HTTPError(url, status, reason, message, None)
+
+        content_encoding = message['Content-Encoding']
+        if content_encoding == 'gzip':
+            data = gzip.decompress(data)
+        elif content_encoding == 'deflate':
+            try:
+                data = zlib.decompress(data)
+            except zlib.error:
+                # Try without zlib header or checksum
+                data = zlib.decompress(data, -15)
+        response = _CachedResponse(url, message, data)
+        if response.cacheable and len(data) <= self.cache_size:
+            with self._lock:
+                if url in self._cache:
+                    self._cached_size -= len(self._cache.pop(url).data)
+                self._cache[url] = response
+                self._cached_size += len(data)
+                while self._cached_size > self.cache_size:
+                    _, old_response = self._cache.popitem(last=False)
+                    self._cached_size -= len(old_response.data)
+        return response.result()
+
+    def _request(self, url, headers):
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or '/'
+        if parts.query:
+            path += f'?{parts.query}'
+        while True:
+            with self._lock:
+                idle_connections = self._pool.get(key)
+                connection = idle_connections.pop() if idle_connections else None
+            reused = connection is not None
+            if connection is None:
+                if parts.scheme == 'https':
+                    connection = HTTPSConnection(
+                        parts.hostname, parts.port, timeout=self.timeout,
+                        context=self.ssl_context)
+                else:
+                    connection = HTTPConnection(
+                        parts.hostname, parts.port, timeout=self.timeout)
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (ConnectionError, HTTPException):
+                connection.close()
+                if reused:
+                    # Connection closed by the server while idle, retry.
+                    continue
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                with self._lock:
+                    idle_connections = self._pool.setdefault(key, [])
+                    if len(idle_connections) < self.connections:
+                        idle_connections.append(connection)
+                        connection = None
+                if connection is not None:
+                    connection.close()
+            return response.status, response.reason, response.msg, data
+
+
+def _expires(message):
+    """Get the monotonic time when a response becomes stale, or ``None``."""
+    directives = {}
+    for directive in message.get('Cache-Control', '').split(','):
+        name, _, value = directive.strip().partition('=')
+        directives[name.lower()] = value.strip('"')
+    if 'no-cache' in directives:
+        return time.monotonic()
+    if 'max-age' in directives:
+        try:
+            return time.monotonic() + int(directives['max-age'])
+        except ValueError:
+            return time.monotonic()
+    if message['Expires']:
+        try:
+            expires = parsedate_to_datetime(message['Expires']).timestamp()
+        except (TypeError, ValueError):
+            return time.monotonic()
+        return time.monotonic() + expires - time.time()
+
+
+class _CachedResponse:
+    """HTTP response stored by :class:`PooledURLFetcher`."""
+    def __init__(self, url, message, data):
+        self.url = url
+        self.data = data
+        self.mime_type = message.get_content_type()
+        self.encoding = message.get_param('charset')
+        self.filename = message.get_filename()
+        self.etag = message['ETag']
+        self.last_modified = message['Last-Modified']
+        expires = _expires(message)
+        self.expires = time.monotonic() if expires is None else expires
+        no_store = 'no-store' in message.get('Cache-Control', '').lower()
+        self.cacheable = not no_store and (
+            expires is not None or self.etag or self.last_modified)
+
+    def result(self):
+        return {
+            'string': self.data,
+            'mime_type': self.mime_type,
+            'encoding': self.encoding,
+            'filename': self.filename,
+            'redirected_url': self.url,
+        }
+
+
 class URLFetchingError(IOError):
     """Some error happened when fetching an URL."""
 